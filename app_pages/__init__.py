@@ -0,0 +1,7 @@
+"""
+Pages of the India weather Streamlit app.
+
+Each page lives in its own module with a ``render()`` function and imports
+its heavy libraries (pandas, plotly, requests, httpx) only when it renders,
+so the app's cold start pays only for the page being shown.
+"""
@@ -0,0 +1,65 @@
+"""Weather Analytics page: charts comparing the major metros."""
+
+import asyncio
+
+import streamlit as st
+
+from app_pages.common import get_weather_data
+from weather_core.fanout import gather_limited
+
+
+def render():
+    """Create weather analytics dashboard"""
+    import pandas as pd
+    import plotly.express as px
+
+    st.header("📈 Weather Analytics Dashboard")
+    
+    # Get data for multiple cities
+    cities_to_analyze = ["Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata"]
+    
+    with st.spinner("Fetching weather data for analytics..."):
+        weather_data = []
+        
+        results = asyncio.run(gather_limited(get_weather_data, cities_to_analyze))
+        for city, data in zip(cities_to_analyze, results):
+            if data:
+                weather_data.append({
+                    'City': city,
+                    'Temperature (°C)': data.temp_c,
+                    'Humidity (%)': data.humidity_pct,
+                    'Wind Speed (m/s)': data.wind_mps,
+                    'Pressure (hPa)': data.pressure_hpa
+                    })
+        
+        if weather_data:
+            df = pd.DataFrame(weather_data)
+            
+            # Temperature comparison chart
+            st.subheader("🌡️ Temperature Comparison")
+            fig_temp = px.bar(df, x='City', y='Temperature (°C)', 
+                            title='Current Temperature Across Cities',
+                            color='Temperature (°C)',
+                            color_continuous_scale='RdYlBu_r')
+            st.plotly_chart(fig_temp, use_container_width=True)
+            
+            # Humidity comparison
+            st.subheader("💧 Humidity Comparison")
+            fig_humidity = px.pie(df, values='Humidity (%)', names='City',
+                                title='Humidity Distribution')
+            st.plotly_chart(fig_humidity, use_container_width=True)
+            
+            # Wind speed comparison
+            st.subheader("💨 Wind Speed Comparison")
+            fig_wind = px.scatter(df, x='City', y='Wind Speed (m/s)', 
+                                size='Wind Speed (m/s)',
+                                title='Wind Speed Across Cities',
+                                color='Wind Speed (m/s)')
+            st.plotly_chart(fig_wind, use_container_width=True)
+            
+            # Data table
+            st.subheader("📊 Detailed Data")
+            st.dataframe(df, use_container_width=True)
+            
+        else:
+            st.error("Could not fetch weather data for analytics. Please check your API key.")
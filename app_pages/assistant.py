@@ -0,0 +1,220 @@
+"""AI Weather Assistant page: rule-based chat about Indian city weather."""
+
+import asyncio
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from app_pages.common import get_forecast_data, get_weather_data
+from weather_core.fanout import as_completed_limited
+from weather_core.intents import extract
+from weather_core.metrics import metrics
+from weather_core.models import Forecast, Observation
+from weather_core.schema import render_comparison_line, render_comparison_summary, weather_report
+
+
+class Heading(str):
+    """A chunk of the answer that is ready before any weather data is fetched"""
+
+
+def process_question(question: str) -> str:
+    """Process user questions and return appropriate responses"""
+    return "".join(stream_question(question))
+
+def stream_question(question: str):
+    """Process a user question, yielding the response in pieces as they become available"""
+    found = extract(question)
+    
+    if found.cities:
+        forecast = "forecast" in found.intents
+        if len(found.cities) == 1:
+            yield Heading(f"📅 24-hour forecast for {found.cities[0]}:\n\n" if forecast else f"🌤️ Weather in {found.cities[0]}:\n\n")
+        else:
+            yield Heading(f"{'📅 24-hour forecasts' if forecast else '📊 Weather comparison'} for {', '.join(found.cities)}:\n\n")
+        
+        # Fetch every city mentioned at once and show each as soon as it arrives
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        fetch = get_forecast_data if forecast else get_weather_data
+        try:
+            if len(found.cities) == 1:
+                data = loop.run_until_complete(fetch(found.cities[0]))
+                yield forecast_text(found.cities[0], data) if forecast else weather_text(found.cities[0], data)
+            else:
+                yield from stream_cities(loop, fetch, found.cities, forecast)
+        finally:
+            loop.close()
+    
+    # General responses
+    elif "help" in found.intents:
+        yield """🤖 I can help you with weather information for Indian cities!
+
+🌤️ What I can do:
+• Get current weather for any Indian city
+• Provide 24-hour weather forecasts  
+• Answer weather-related questions
+• Handle common city name variations
+
+🏙️ Supported cities include:
+• Delhi, Mumbai, Bangalore, Chennai, Kolkata
+• Hyderabad, Pune, Ahmedabad, Jaipur, Lucknow
+• And many more!
+
+💡 Try asking:
+• "What's the weather in Delhi?"
+• "Forecast for Mumbai"
+• "Temperature in Bangalore"
+• "Weather tomorrow in Chennai"
+• "How's the weather in Kolkata?" """
+    
+    elif "temperature" in found.intents:
+        yield "I can help with temperature information! Try asking about a specific city like 'What's the temperature in Delhi?'"
+    
+    elif "forecast" in found.intents:
+        yield "I can provide weather forecasts! Try asking 'What's the forecast for Mumbai?' or 'Weather tomorrow in Delhi'"
+    
+    else:
+        yield """I'm here to help with weather information! Try asking me about:
+
+• Weather in specific Indian cities
+• Temperature, humidity, or wind conditions  
+• Weather forecasts and tomorrow's weather
+• General weather questions
+
+For example: "What's the weather in Delhi?" or "Forecast for Mumbai tomorrow" """
+
+def stream_cities(loop, fetch, cities: tuple[str, ...], forecast: bool):
+    """One section per city in the order the fetches finish, then the comparison summary"""
+    results = as_completed_limited(fetch, cities)
+    reports, missing = [], []
+    first = True
+    try:
+        while True:
+            try:
+                city, data = loop.run_until_complete(anext(results))
+            except StopAsyncIteration:
+                break
+            if forecast:
+                yield ("" if first else "\n\n") + f"📍 {city}:\n" + forecast_text(city, data)
+            elif data:
+                report = weather_report(city, data)
+                reports.append(report)
+                yield ("" if first else "\n") + render_comparison_line(report)
+            else:
+                missing.append(city)
+                continue
+            first = False
+    finally:
+        loop.run_until_complete(results.aclose())
+    if not forecast:
+        summary = render_comparison_summary(reports, missing)
+        if summary:
+            yield ("\n" if reports else "") + summary
+
+def forecast_text(city: str, forecast_data: Forecast | None) -> str:
+    """The next 24 hours of one city's forecast, one line per 3-hour slot"""
+    if not forecast_data:
+        return f"Sorry, I couldn't fetch forecast data for {city}. Please try again."
+    forecasts = []
+    for item in forecast_data.points[:8]:  # First 24 hours
+        dt = datetime.fromisoformat(item.dt_txt)
+        temp = item.temp_c
+        weather = item.condition
+        forecasts.append(f"{dt.strftime('%H:%M')}: {temp}°C, {weather}")
+    return "\n".join(forecasts)
+
+def weather_text(city: str, weather_data: Observation | None) -> str:
+    """Current conditions for one city"""
+    if not weather_data:
+        return f"Sorry, I couldn't fetch weather data for {city}. Please check the city name and try again."
+    weather = weather_data.condition.title()
+    temp = weather_data.temp_c
+    feels_like = weather_data.feels_like_c
+    humidity = weather_data.humidity_pct
+    wind = weather_data.wind_mps
+    
+    return (
+        f"🌡️ Temperature: {temp} °C\n"
+        f"🔥 Feels Like: {feels_like} °C\n"
+        f"☁️ Condition: {weather}\n"
+        f"💧 Humidity: {humidity}%\n"
+        f"💨 Wind Speed: {wind} m/s"
+    )
+
+def render_streamed_answer(question: str) -> str:
+    """Render the assistant's answer as it streams in and return the full text
+
+    Time to first token is measured to the first chunk of the actual answer;
+    a heading streamed before the weather is fetched doesn't count.
+    """
+    placeholder = st.empty()
+    start = time.perf_counter()
+    response = ""
+    answered = False
+    for chunk in stream_question(question):
+        if not answered and not isinstance(chunk, Heading):
+            answered = True
+            ttft = time.perf_counter() - start
+            metrics.observe("assistant.ttft_seconds", ttft)
+            st.session_state.last_ttft_ms = ttft * 1000
+        response += chunk
+        placeholder.markdown(f'<div class="chat-message ai-message"><strong>AI Assistant:</strong> {response}▌</div>', unsafe_allow_html=True)
+    metrics.observe("assistant.turn_seconds", time.perf_counter() - start)
+    return response
+
+
+def render():
+    """Render the chat assistant"""
+    st.header("🤖 AI Weather Assistant")
+    st.write("Ask me anything about weather in India!")
+    
+    # Chat interface
+    st.subheader("💬 Chat with AI Assistant")
+    
+    # Display chat history
+    for message in st.session_state.chat_history:
+        if message["role"] == "user":
+            st.markdown(f'<div class="chat-message user-message"><strong>You:</strong> {message["content"]}</div>', unsafe_allow_html=True)
+        else:
+            st.markdown(f'<div class="chat-message ai-message"><strong>AI Assistant:</strong> {message["content"]}</div>', unsafe_allow_html=True)
+    
+    # Chat input
+    user_question = st.text_input("Ask a question:", placeholder="e.g., What's the weather in Delhi?")
+    
+    if st.button("Ask AI Assistant", type="primary"):
+        if user_question:
+            # Add user message to chat
+            st.session_state.chat_history.append({"role": "user", "content": user_question})
+            
+            # Stream the AI response into the chat as it arrives
+            ai_response = render_streamed_answer(user_question)
+            st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
+            
+            # Rerun to show new messages
+            st.rerun()
+    
+    if "last_ttft_ms" in st.session_state:
+        st.caption(f"⚡ Time to first token: {st.session_state.last_ttft_ms:.0f} ms")
+    
+    # Clear chat button
+    if st.button("Clear Chat"):
+        st.session_state.chat_history = []
+        st.rerun()
+    
+    # Example questions
+    st.subheader("💡 Example Questions")
+    example_questions = [
+        "What's the weather in Delhi?",
+        "Temperature in Mumbai",
+        "How's the weather in Bangalore?",
+        "Weather forecast for Chennai",
+        "What can you help me with?"
+    ]
+    
+    for question in example_questions:
+        if st.button(question, key=f"example_{question}"):
+            st.session_state.chat_history.append({"role": "user", "content": question})
+            ai_response = render_streamed_answer(question)
+            st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
+            st.rerun()
@@ -0,0 +1,95 @@
+"""
+Shared configuration, city handling and weather fetchers for the app pages.
+
+Heavy libraries are imported inside the functions that need them, so loading
+this module costs next to nothing on pages that never fetch.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+from weather_core.cities import INDIAN_CITIES, REGION_CITIES, canonical_city
+
+# Load environment variables from .env
+load_dotenv()
+API_KEY = os.getenv('OPENWEATHER_API_KEY')
+
+# Live dashboard: tile refresh interval and how long an observation is reused
+LIVE_REFRESH_S = float(os.getenv('WEATHER_LIVE_REFRESH_S', '30'))
+OBSERVATION_TTL_S = 600  # OWM refreshes ~every 10 minutes
+HOT_WINDOW_S = 3600
+
+# List of supported cities (see weather_core.cities)
+SUPPORTED_CITIES = INDIAN_CITIES
+
+def normalize_city_name(city_input):
+    """Normalize city name and handle common misspellings"""
+    city_lower = city_input.lower().strip()
+    
+    # Exact names, misspellings and state names
+    city = canonical_city(city_lower) or REGION_CITIES.get(city_lower)
+    if city:
+        return city
+    
+    # Check for partial matches
+    for city in SUPPORTED_CITIES:
+        if city_lower in city.lower() or city.lower() in city_lower:
+            return city
+    
+    return None
+
+_providers = None
+_store = None
+
+def weather_providers():
+    """The shared provider chain, built on first use so its latency history persists across reruns"""
+    global _providers
+    if _providers is None:
+        from weather_core.providers import providers_from_env
+        _providers = providers_from_env(API_KEY)
+    return _providers
+
+async def get_weather_data(city: str):
+    """Get current weather for a city as an ``Observation``, or None"""
+    return await weather_providers().current(city)
+
+async def get_forecast_data(city: str):
+    """Get the 5-day forecast for a city as a ``Forecast``, or None"""
+    return await weather_providers().forecast(city)
+
+def shared_store():
+    """The observation cache; shared with the MCP server when WEATHER_STORE names its SQLite file"""
+    global _store
+    if _store is None:
+        from weather_core.store import open_store
+        _store = open_store()
+    return _store
+
+async def live_observations(cities: list[str]) -> dict:
+    """Current weather for each city from the shared observation cache.
+
+    Fresh entries (written by the MCP server or another session) are used as
+    they are; missing or expired ones are fetched concurrently and written
+    back. The cities are marked hot so the server keeps them refreshed.
+    """
+    import time
+    from weather_core.fanout import gather_limited
+
+    store = shared_store()
+    now = time.time()
+    observations = {}
+    for city in cities:
+        entry = store.get(f"weather:{city}")
+        store.mark_hot(f"weather:{city}", now + OBSERVATION_TTL_S * 0.9, now + HOT_WINDOW_S)
+        observations[city] = entry
+    expired = [city for city, entry in observations.items() if entry is None or not entry.fresh]
+    fetched = dict(zip(expired, await gather_limited(get_weather_data, expired))) if expired else {}
+    for city, data in fetched.items():
+        if data is not None:
+            store.put_if_changed(f"weather:{city}", data, OBSERVATION_TTL_S)
+    return {
+        # An expired observation is still better than none if the refetch failed
+        city: fetched.get(city) or (entry.value if entry else None)
+        for city, entry in observations.items()
+    }
@@ -0,0 +1,94 @@
+"""Multi-City Comparison page: side-by-side charts for chosen cities."""
+
+import asyncio
+
+import streamlit as st
+
+from app_pages.common import SUPPORTED_CITIES, get_weather_data
+from weather_core.fanout import gather_limited
+
+
+def render():
+    """Create multi-city weather comparison"""
+    import pandas as pd
+    import plotly.express as px
+
+    st.header("🏙️ Multi-City Weather Comparison")
+    
+    # City selection
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Select Cities to Compare")
+        selected_cities = st.multiselect(
+            "Choose cities:",
+            SUPPORTED_CITIES,
+            default=["Delhi", "Mumbai", "Bangalore"]
+        )
+    
+    with col2:
+        st.subheader("Comparison Options")
+        compare_temp = st.checkbox("Temperature", value=True)
+        compare_humidity = st.checkbox("Humidity", value=True)
+        compare_wind = st.checkbox("Wind Speed", value=True)
+    
+    if selected_cities and st.button("Compare Weather", type="primary"):
+        with st.spinner("Fetching weather data for comparison..."):
+            comparison_data = []
+            
+            results = asyncio.run(gather_limited(get_weather_data, selected_cities))
+            for city, data in zip(selected_cities, results):
+                if data:
+                    comparison_data.append({
+                        'City': city,
+                        'Temperature (°C)': data.temp_c,
+                        'Humidity (%)': data.humidity_pct,
+                        'Wind Speed (m/s)': data.wind_mps,
+                        'Condition': data.condition.title()
+                        })
+            
+            if comparison_data:
+                df = pd.DataFrame(comparison_data)
+                
+                # Create comparison charts
+                if compare_temp:
+                    st.subheader("🌡️ Temperature Comparison")
+                    fig_temp = px.bar(df, x='City', y='Temperature (°C)',
+                                    title='Temperature Comparison',
+                                    color='Temperature (°C)')
+                    st.plotly_chart(fig_temp, use_container_width=True)
+                
+                if compare_humidity:
+                    st.subheader("💧 Humidity Comparison")
+                    fig_humidity = px.bar(df, x='City', y='Humidity (%)',
+                                        title='Humidity Comparison',
+                                        color='Humidity (%)')
+                    st.plotly_chart(fig_humidity, use_container_width=True)
+                
+                if compare_wind:
+                    st.subheader("💨 Wind Speed Comparison")
+                    fig_wind = px.bar(df, x='City', y='Wind Speed (m/s)',
+                                    title='Wind Speed Comparison',
+                                    color='Wind Speed (m/s)')
+                    st.plotly_chart(fig_wind, use_container_width=True)
+                
+                # Side-by-side comparison table
+                st.subheader("📋 Side-by-Side Comparison")
+                st.dataframe(df, use_container_width=True)
+                
+                # Weather conditions summary
+                st.subheader("🌤️ Weather Conditions Summary")
+                for _, row in df.iterrows():
+                    col1, col2, col3 = st.columns([1, 2, 1])
+                    with col1:
+                        st.write(f"**{row['City']}**")
+                    with col2:
+                        st.write(f"Temperature: {row['Temperature (°C)']}°C")
+                        st.write(f"Humidity: {row['Humidity (%)']}%")
+                        st.write(f"Wind: {row['Wind Speed (m/s)']} m/s")
+                    with col3:
+                        st.write(f"*{row['Condition']}*")
+                    st.divider()
+                
+            else:
+                st.error("Could not fetch weather data for comparison. Please check your API key.")
@@ -0,0 +1,144 @@
+"""Weather Dashboard page: live tiles for many cities, or one city on demand."""
+
+import asyncio
+import time
+
+import streamlit as st
+
+from app_pages.common import (
+    LIVE_REFRESH_S,
+    SUPPORTED_CITIES,
+    get_weather_data,
+    live_observations,
+    weather_providers,
+)
+from weather_core.icons import icon_image
+from weather_core.metrics import metrics
+from weather_core.models import Observation
+
+
+def draw_tile(city: str, data: Observation, previous: Observation | None) -> None:
+    """One city's current conditions; the delta is against the previous observation shown"""
+    temp = data.temp_c
+    delta = f"{temp - previous.temp_c:+.1f} °C" if previous else None
+    metric, icon = st.columns([3, 1])
+    metric.metric(city, f"{temp:.1f} °C", delta=delta, delta_color="inverse")
+    icon.image(icon_image(data.icon), width=48)
+    st.caption(
+        f"{data.condition.title()} · 💧 {data.humidity_pct}% · "
+        f"💨 {data.wind_mps} m/s  \n"
+        f"Observed {time.strftime('%H:%M', time.localtime(data.dt))} · {data.provider}"
+    )
+
+
+@st.fragment(run_every=LIVE_REFRESH_S)
+def live_tiles(placeholders: dict):
+    """Refresh the tiles on a timer without rerunning the page.
+
+    Each tile lives in an ``st.empty`` created by the full page run, so only
+    the tiles whose observation time changed are redrawn.
+    """
+    observations = asyncio.run(live_observations(list(placeholders)))
+    shown = st.session_state.setdefault("live_shown", {})
+    redrawn = 0
+    for city, data in observations.items():
+        if data is None:
+            if city not in shown:
+                placeholders[city].warning(f"{city}: no data yet")
+            continue
+        if city in shown and shown[city].dt == data.dt:
+            continue
+        with placeholders[city].container(border=True):
+            draw_tile(city, data, shown.get(city))
+        shown[city] = data
+        redrawn += 1
+    metrics.incr("dashboard.tiles_redrawn", redrawn)
+    st.caption(
+        f"Checked {time.strftime('%H:%M:%S')} · {redrawn} of {len(observations)} tiles updated · "
+        f"refreshes every {LIVE_REFRESH_S:.0f} s"
+    )
+
+
+def render_live():
+    """Tiles for the chosen cities, kept current by the live_tiles fragment"""
+    cities = st.multiselect("Cities:", SUPPORTED_CITIES, default=SUPPORTED_CITIES[:8], key="live_cities")
+    columns = st.columns(4)
+    placeholders = {city: columns[i % 4].empty() for i, city in enumerate(cities)}
+    # A full run creates new, empty placeholders: every tile must be drawn again
+    st.session_state["live_shown"] = {}
+    if placeholders:
+        live_tiles(placeholders)
+
+
+def render():
+    """Render the current weather dashboard"""
+    # Main weather dashboard
+    st.header("🌤️ Current Weather Dashboard")
+    
+    # Off by default: live tiles fetch every city on the first render
+    if st.toggle("Live mode", value=False, help="Tiles for several cities that update on their own"):
+        render_live()
+        return
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        city = st.selectbox("Select a city:", SUPPORTED_CITIES)
+        
+        if st.button("Get Weather", type="primary"):
+            with st.spinner("Fetching weather data..."):
+                data = asyncio.run(get_weather_data(city))
+                
+                if data:
+                    # Display weather information
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        st.metric("Temperature (°C)", f"{data.temp_c:.1f}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    with col2:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        st.metric("Feels Like (°C)", f"{data.feels_like_c:.1f}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    with col3:
+                        st.markdown('<div class="metric-card">', unsafe_allow_html=True)
+                        st.metric("Humidity (%)", f"{data.humidity_pct}")
+                        st.markdown('</div>', unsafe_allow_html=True)
+                    
+                    # Weather details
+                    st.subheader(f"Weather in {city}")
+                    weather_desc = data.condition.title()
+                    st.write(f"**Condition:** {weather_desc}")
+                    st.write(f"**Wind Speed:** {data.wind_mps} m/s")
+                    st.write(f"**Pressure:** {data.pressure_hpa} hPa")
+                    
+                    # Weather icon
+                    icon_code = data.icon
+                    st.image(icon_image(icon_code), width=100)
+                    st.caption(f"Source: {data.provider}")
+                    
+                else:
+                    st.error("Could not fetch weather data. Please check the city name or try again later.")
+    
+    with col2:
+        st.subheader("📊 Quick Stats")
+        st.write("**Total Cities:** 20")
+        st.write(f"**Data Sources:** {', '.join(weather_providers().names)}")
+        st.write("**Update Frequency:** Real-time")
+        
+        st.subheader("🔧 Quick Actions")
+        if st.button("Test MCP Connection"):
+            with st.spinner("Testing MCP server..."):
+                try:
+                    # Test MCP connection
+                    result = asyncio.run(get_weather_data("Delhi"))
+                    if result:
+                        st.success("MCP connection successful!")
+                        st.info(f"Delhi temperature: {result.temp_c}°C")
+                    else:
+                        st.error("MCP connection failed")
+                except Exception as e:
+                    st.error(f"MCP connection failed: {str(e)}")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark: decoding upstream payloads into cache records.
+
+Compares three ways of turning OpenWeatherMap ``/weather`` and ``/forecast``
+response bytes into what the cache holds:
+
+* ``raw dict``: ``json.loads`` and keep the whole tree
+* ``dict``: ``json.loads``, then copy the used fields into an OWM-layout dict
+  (what the providers did before weather_core.models)
+* ``struct``: the providers' typed msgspec decoding into ``Observation`` and
+  ``Forecast`` records
+
+For each it reports decode time, the memory retained per city (measured with
+tracemalloc over many cities) and the size of the serialized cache entry.
+Payloads are generated, so no API key or network is needed.
+
+Usage:
+    python benchmarks/decode_models.py [--cities 500] [--repeat 2000]
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weather_core.models import encode
+from weather_core.providers import OpenWeatherMapProvider
+
+CONDITIONS = [("clear sky", "01"), ("few clouds", "02"), ("scattered clouds", "03"), ("light rain", "10")]
+
+
+def owm_step(rng: random.Random, dt: int) -> dict:
+    description, icon = rng.choice(CONDITIONS)
+    temp = round(rng.uniform(20, 40), 2)
+    return {
+        "dt": dt,
+        "main": {
+            "temp": temp, "feels_like": round(temp + rng.uniform(0, 4), 2), "temp_min": temp, "temp_max": temp,
+            "pressure": rng.randint(1000, 1015), "sea_level": 1008, "grnd_level": 950,
+            "humidity": rng.randint(30, 95), "temp_kf": 0,
+        },
+        "weather": [{"id": 800, "main": description.split()[-1].title(), "description": description, "icon": icon + "d"}],
+        "clouds": {"all": rng.randint(0, 100)},
+        "wind": {"speed": round(rng.uniform(0, 8), 2), "deg": rng.randint(0, 359), "gust": round(rng.uniform(0, 12), 2)},
+        "visibility": 10000,
+        "pop": round(rng.random(), 2),
+        "sys": {"pod": "d"},
+        "dt_txt": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(dt)),
+    }
+
+
+def owm_weather(rng: random.Random, city: str) -> bytes:
+    step = owm_step(rng, 1_760_000_000)
+    del step["pop"], step["dt_txt"]
+    step.update({
+        "coord": {"lon": 73.85, "lat": 18.52}, "base": "stations", "timezone": 19800, "id": 1259229,
+        "name": city, "cod": 200, "sys": {"type": 1, "id": 9224, "country": "IN", "sunrise": 1, "sunset": 2},
+    })
+    return json.dumps(step).encode()
+
+
+def owm_forecast(rng: random.Random, city: str) -> bytes:
+    return json.dumps({
+        "cod": "200", "message": 0, "cnt": 40,
+        "list": [owm_step(rng, 1_760_000_000 + i * 10800) for i in range(40)],
+        "city": {"id": 1259229, "name": city, "coord": {"lat": 18.52, "lon": 73.85}, "country": "IN",
+                 "population": 3124458, "timezone": 19800, "sunrise": 1, "sunset": 2},
+    }).encode()
+
+
+def _legacy_main(raw: dict) -> dict:
+    main = raw["main"]
+    return {"temp": main["temp"], "feels_like": main["feels_like"], "humidity": main["humidity"],
+            "pressure": main["pressure"]}
+
+
+def legacy_current(city: str, body: bytes) -> dict:
+    raw = json.loads(body)
+    return {
+        "provider": "owm", "name": city, "dt": raw["dt"], "main": _legacy_main(raw),
+        "wind": {"speed": raw["wind"]["speed"]},
+        "weather": [{"description": w["description"], "icon": w["icon"]} for w in raw["weather"][:1]],
+    }
+
+
+def legacy_forecast(city: str, body: bytes) -> dict:
+    items = []
+    for step in json.loads(body)["list"]:
+        item = {
+            "dt": step["dt"], "dt_txt": step["dt_txt"], "main": _legacy_main(step),
+            "wind": {"speed": step["wind"]["speed"]},
+            "weather": [{"description": w["description"], "icon": w["icon"]} for w in step["weather"][:1]],
+        }
+        if "rain" in step:
+            item["rain"] = {"3h": step["rain"].get("3h", 0.0)}
+        items.append(item)
+    return {"provider": "owm", "city": {"name": city}, "list": items}
+
+
+def decode_time_us(decode, bodies: list[tuple[str, bytes]], repeat: int) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        decode(*bodies[i % len(bodies)])
+    return (time.perf_counter() - start) * 1e6 / repeat
+
+
+def retained_bytes(decode, bodies: list[tuple[str, bytes]]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [decode(city, body) for city, body in bodies]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / len(bodies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload decoding benchmark")
+    parser.add_argument("--cities", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    owm = OpenWeatherMapProvider("benchmark")
+    kinds = {
+        "weather": ([(f"City{i}", owm_weather(rng, f"City{i}")) for i in range(args.cities)],
+                    {"raw dict": lambda city, body: json.loads(body), "dict": legacy_current, "struct": owm._current}),
+        "forecast": ([(f"City{i}", owm_forecast(rng, f"City{i}")) for i in range(args.cities)],
+                     {"raw dict": lambda city, body: json.loads(body), "dict": legacy_forecast, "struct": owm._forecast}),
+    }
+    for kind, (bodies, decoders) in kinds.items():
+        size = sum(len(body) for _, body in bodies) / len(bodies)
+        print(f"/{kind}: {size:,.0f} byte payloads, {len(bodies)} cities")
+        for name, decode in decoders.items():
+            sample = decode(*bodies[0])
+            cached = len(encode(sample)) if name == "struct" else len(json.dumps(sample, separators=(",", ":")))
+            print(
+                f"  {name:<9} {decode_time_us(decode, bodies, args.repeat):8.1f} µs/decode  "
+                f"{retained_bytes(decode, bodies):9,.0f} B/city in memory  "
+                f"{cached:7,} B/city in SQLite"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: city and intent extraction for the rule-based chat responders.
+
+Compares the old chain of substring checks (first matching city, then a
+word-by-word fuzzy fallback) with the compiled single-pass extractor in
+weather_core.intents over a generated corpus of questions that mention zero
+to three cities, by name, alias or state.
+
+Usage:
+    python benchmarks/intent_extraction.py [--questions 50000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weather_core.cities import CITY_ALIASES, INDIAN_CITIES, REGION_CITIES
+from weather_core.intents import extract
+
+TEMPLATES = [
+    "What's the weather in {}?",
+    "Temperature in {} right now",
+    "How's the weather in {} today?",
+    "Weather forecast for {} tomorrow",
+    "Is it humid in {} this evening?",
+    "Compare {}",
+    "Will it be windy in {} next week?",
+    "Tell me the upcoming forecast for {} please",
+]
+GENERAL = [
+    "What can you help me with?",
+    "Help",
+    "How do forecasts work?",
+    "Tell me about temperature",
+    "How are you doing in general?",
+    "Is an umbrella a good idea?",
+]
+
+# The substring checks the responders used before weather_core.intents
+MAPPING = {
+    "banglore": "bangalore", "bombay": "mumbai", "calcutta": "kolkata", "madras": "chennai",
+    "bengaluru": "bangalore", "karnataka": "bangalore", "maharashtra": "mumbai",
+    "tamil nadu": "chennai", "west bengal": "kolkata",
+}
+
+
+def legacy_normalize(word: str) -> str | None:
+    word = word.lower().strip()
+    for city in INDIAN_CITIES:
+        if city.lower() == word:
+            return city
+    if word in MAPPING:
+        return next(city for city in INDIAN_CITIES if city.lower() == MAPPING[word])
+    for city in INDIAN_CITIES:
+        if word in city.lower() or city.lower() in word:
+            return city
+    return None
+
+
+def legacy_extract(question: str) -> tuple[tuple[str, ...], bool]:
+    question_lower = question.lower()
+    detected = None
+    for city in INDIAN_CITIES:
+        if city.lower() in question_lower:
+            detected = city
+            break
+    if not detected:
+        for word in question_lower.split():
+            detected = legacy_normalize(word)
+            if detected:
+                break
+    forecast = any(word in question_lower for word in ["forecast", "tomorrow", "next", "future", "upcoming"])
+    return ((detected,) if detected else ()), forecast
+
+
+def corpus(size: int, seed: int = 11) -> list[tuple[str, tuple[str, ...]]]:
+    rng = random.Random(seed)
+    names = [(city, city) for city in INDIAN_CITIES]
+    names += [(alias.title(), city) for alias, city in {**CITY_ALIASES, **REGION_CITIES}.items()]
+    questions = []
+    for _ in range(size):
+        if rng.random() < 0.15:
+            questions.append((rng.choice(GENERAL), ()))
+            continue
+        picked = rng.sample(names, rng.choice([1, 1, 1, 2, 3]))
+        expected = tuple(dict.fromkeys(city for _, city in picked))
+        questions.append((rng.choice(TEMPLATES).format(" and ".join(name for name, _ in picked)), expected))
+    return questions
+
+
+def measure(name: str, fn, questions) -> None:
+    start = time.perf_counter()
+    results = [fn(question) for question, _ in questions]
+    elapsed = time.perf_counter() - start
+    exact = sum(found == expected for found, (_, expected) in zip(results, questions))
+    multi = [(found, expected) for found, (_, expected) in zip(results, questions) if len(expected) > 1]
+    multi_ok = sum(found == expected for found, expected in multi)
+    spurious = sum(bool(found) for found, (_, expected) in zip(results, questions) if not expected)
+    general = sum(1 for _, expected in questions if not expected)
+    print(
+        f"{name:<10} {elapsed * 1e6 / len(questions):7.2f} µs/question  "
+        f"exact cities {exact / len(questions):6.1%}  "
+        f"multi-city {multi_ok}/{len(multi)}  "
+        f"spurious city {spurious}/{general}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat extraction benchmark")
+    parser.add_argument("--questions", type=int, default=50000)
+    args = parser.parse_args()
+
+    questions = corpus(args.questions)
+    print(f"{len(questions)} questions")
+    measure("substring", lambda q: legacy_extract(q)[0], questions)
+    measure("compiled", lambda q: extract(q).cities, questions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: prompt size and latency over a long agent chat session.
+
+Simulates a 200-turn weather chat against a stand-in LLM whose latency grows
+with prompt size, once with MCPAgent's unbounded history and once with the
+MemoryPolicy from weather_core.memory. No API keys or network are needed.
+
+Usage:
+    python benchmarks/memory_session.py [--turns 200] [--budget 2000]
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weather_core.cities import INDIAN_CITIES
+from weather_core.memory import MemoryPolicy, message_tokens
+
+# Stand-in LLM cost model: fixed overhead plus prefill time per prompt token
+BASE_LATENCY_S = 0.35
+PER_TOKEN_S = 0.00025
+
+
+@dataclass
+class Message:
+    type: str
+    content: str
+
+
+def reading(city: str, rng: random.Random) -> str:
+    return (
+        f"Weather in {city}:\n"
+        f"Temperature: {rng.uniform(18, 42):.1f} °C\n"
+        f"Feels Like: {rng.uniform(18, 46):.1f} °C\n"
+        f"Condition: {rng.choice(['Haze', 'Clear Sky', 'Light Rain', 'Broken Clouds'])}\n"
+        f"Humidity: {rng.randint(20, 95)}%\n"
+        f"Wind Speed: {rng.uniform(0, 9):.1f} m/s"
+    )
+
+
+def run(turns: int, policy: MemoryPolicy | None, seed: int = 7) -> list[tuple[int, int, float, float]]:
+    rng = random.Random(seed)
+    history = [Message("system", "You are a helpful weather assistant for Indian cities. " * 4)]
+    rows = []
+    cities = INDIAN_CITIES[:8]  # a realistic session revisits a handful of cities
+    for turn in range(1, turns + 1):
+        city = rng.choice(cities)
+        question = Message("human", f"What's the weather in {city} right now?")
+        prompt_tokens = sum(message_tokens(m) for m in history) + message_tokens(question)
+        llm_latency = BASE_LATENCY_S + PER_TOKEN_S * prompt_tokens
+        history.append(question)
+        history.append(Message("tool", reading(city, rng)))
+        history.append(Message("ai", reading(city, rng) + "\nIt is a typical day for the season."))
+        start = time.perf_counter()
+        if policy is not None:
+            history = policy.compact(history)
+        compact_s = time.perf_counter() - start
+        rows.append((turn, prompt_tokens, llm_latency, compact_s))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent memory growth benchmark")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=2000, help="MemoryPolicy token budget")
+    args = parser.parse_args()
+
+    unbounded = run(args.turns, None)
+    bounded = run(args.turns, MemoryPolicy(token_budget=args.budget))
+
+    print(f"{'turn':>5} | {'unbounded tok':>13} {'est. latency':>12} | {'bounded tok':>11} {'est. latency':>12} {'compact':>9}")
+    print("-" * 75)
+    step = max(1, args.turns // 10)
+    for (turn, tok_u, lat_u, _), (_, tok_b, lat_b, compact_s) in zip(unbounded, bounded):
+        if turn == 1 or turn % step == 0:
+            print(f"{turn:>5} | {tok_u:>13} {lat_u:>11.2f}s | {tok_b:>11} {lat_b:>11.2f}s {compact_s * 1000:>7.2f}ms")
+
+    total_u = sum(row[1] for row in unbounded)
+    total_b = sum(row[1] for row in bounded)
+    print("-" * 75)
+    print(f"total prompt tokens: unbounded={total_u} bounded={total_b} ({total_b / total_u:.0%})")
+    print(f"total est. LLM time: unbounded={sum(r[2] for r in unbounded):.1f}s bounded={sum(r[2] for r in bounded):.1f}s")
+
+
+if __name__ == "__main__":
+    main()
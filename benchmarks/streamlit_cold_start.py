@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Streamlit app cold start per page.
+
+Each measurement runs in a fresh interpreter so nothing is cached:
+
+* imports: the old module-level import set versus importing each page's
+  ``app_pages`` module (with streamlit), and how many modules that loads.
+  Pages are read from ``PAGES`` in india_streamlit_app.py; libraries a page
+  imports inside ``render()`` are counted in its first render instead.
+* first render: a full script run of india_streamlit_app.py for each page
+  via streamlit.testing, with ``WEATHER_PROVIDERS=local`` so pages that
+  fetch while rendering (Weather Analytics) are timed without the network
+
+Usage:
+    python benchmarks/streamlit_cold_start.py [--repeat 3]
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+EAGER_IMPORTS = (
+    "import streamlit, requests, asyncio, json, dotenv, pandas, plotly.express, plotly.graph_objects, "
+    "datetime, folium, streamlit_folium, httpx"
+)
+ENV = dict(os.environ, WEATHER_PROVIDERS="local", WEATHER_STORE="", WEATHER_CASSETTE="")
+
+TIMED = "import time; t = time.perf_counter(); {code}; print(time.perf_counter() - t)"
+
+PAGE_IMPORT = """
+import sys, time
+before = len(sys.modules)
+t = time.perf_counter()
+import importlib, streamlit
+importlib.import_module({module!r})
+elapsed = time.perf_counter() - t
+print(len(sys.modules) - before, elapsed)
+"""
+
+RENDER = """
+import time
+t = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("india_streamlit_app.py", default_timeout=60)
+app.run()
+if {page!r} != "Weather Dashboard":
+    app.sidebar.selectbox[0].select({page!r}).run()
+assert not app.exception, app.exception
+print(time.perf_counter() - t)
+"""
+
+
+def app_pages() -> dict[str, str]:
+    """Page name -> app_pages module, from the app's own PAGES table."""
+    tree = ast.parse((ROOT / "india_streamlit_app.py").read_text(encoding="utf-8"))
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "PAGES" for t in node.targets):
+            return {page: f"app_pages.{module}" for page, module in ast.literal_eval(node.value).items()}
+    raise SystemExit("PAGES not found in india_streamlit_app.py")
+
+
+def run(code: str, repeat: int) -> tuple[float, str] | None:
+    """Median of the last number printed by ``code`` (seconds, as ms) and the rest of that line."""
+    samples = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=ENV, capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        *extra, seconds = result.stdout.strip().splitlines()[-1].split()
+        samples.append((float(seconds), " ".join(extra)))
+    seconds, extra = sorted(samples)[len(samples) // 2]
+    return seconds * 1000, extra
+
+
+def show(label: str, value: tuple[float, str] | None, unit: str = "") -> None:
+    if value is None:
+        print(f"  {label:<28} n/a (missing dependency)")
+    else:
+        print(f"  {label:<28} {value[0]:8.0f} ms" + (f"  {value[1]} {unit}" if unit else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlit cold start benchmark")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = app_pages()
+    print("Import cost")
+    show("old eager imports", run(TIMED.format(code=EAGER_IMPORTS), args.repeat))
+    for page, module in pages.items():
+        show(page, run(PAGE_IMPORT.format(module=module), args.repeat), "modules loaded")
+
+    print("First render (fresh interpreter)")
+    for page in pages:
+        show(page, run(RENDER.format(page=page), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
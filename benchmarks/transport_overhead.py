@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: connection overhead and session capacity per MCP transport.
+
+Starts mcpserver/server.py once per transport and measures, without touching
+the weather API (only initialize + list_tools are exercised):
+
+* connect: time to open a transport and complete the MCP initialize handshake
+* call: round-trip of one list_tools request on an open session
+* sessions: how many sessions one server process holds open concurrently,
+  and the server's resident memory per open session
+
+stdio is one process per session by construction, so only its connect cost
+(interpreter start + imports) is measured.
+
+Usage:
+    python benchmarks/transport_overhead.py [--sessions 200] [--samples 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVER = ROOT / "mcpserver" / "server.py"
+PORT = 8765
+
+
+def rss_kb(pid: int) -> int:
+    """Resident set size of a process in KiB (Linux only, 0 elsewhere)."""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def transport_streams(name: str):
+    if name == "stdio":
+        return stdio_client(StdioServerParameters(command=sys.executable, args=[str(SERVER), "--transport", "stdio"]))
+    if name == "sse":
+        return sse_client(f"http://127.0.0.1:{PORT}/sse")
+    return streamablehttp_client(f"http://127.0.0.1:{PORT}/mcp")
+
+
+async def open_session(stack: AsyncExitStack, name: str) -> ClientSession:
+    streams = await stack.enter_async_context(transport_streams(name))
+    session = await stack.enter_async_context(ClientSession(streams[0], streams[1]))
+    await session.initialize()
+    return session
+
+
+async def measure(name: str, samples: int, max_sessions: int) -> dict:
+    connect, call = [], []
+    for _ in range(samples):
+        async with AsyncExitStack() as stack:
+            start = time.perf_counter()
+            session = await open_session(stack, name)
+            connect.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            await session.list_tools()
+            call.append(time.perf_counter() - start)
+    result = {
+        "connect_ms": statistics.median(connect) * 1000,
+        "call_ms": statistics.median(call) * 1000,
+        "sessions": 1 if name == "stdio" else 0,
+        "kb_per_session": 0.0,
+    }
+    if name == "stdio":
+        return result
+
+    async with AsyncExitStack() as stack:
+        opened = 0
+        for _ in range(max_sessions):
+            try:
+                # No wait_for: the session's context managers must stay in this task
+                await open_session(stack, name)
+            except Exception:
+                break
+            opened += 1
+        result["sessions"] = opened
+    return result
+
+
+def start_server(name: str, extra: list[str]) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, str(SERVER), "--transport", name, "--host", "127.0.0.1", "--port", str(PORT), *extra],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    time.sleep(2.0)
+    return process
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="MCP transport overhead benchmark")
+    parser.add_argument("--sessions", type=int, default=200, help="max concurrent sessions to try")
+    parser.add_argument("--samples", type=int, default=20, help="connect/call samples per transport")
+    args = parser.parse_args()
+
+    cases = [("stdio", []), ("sse", []), ("streamable-http", []), ("streamable-http", ["--stateless"])]
+    print(f"{'transport':<28} {'connect':>10} {'call':>9} {'sessions':>9} {'KiB/session':>12}")
+    for name, extra in cases:
+        server = None if name == "stdio" else start_server(name, extra)
+        try:
+            idle_kb = rss_kb(server.pid) if server else 0
+            result = await measure(name, args.samples, args.sessions)
+            if server and result["sessions"]:
+                # Sessions are closed by now; sample memory while a fresh batch is open
+                async with AsyncExitStack() as stack:
+                    for _ in range(result["sessions"]):
+                        await open_session(stack, name)
+                    result["kb_per_session"] = (rss_kb(server.pid) - idle_kb) / result["sessions"]
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+        label = name + (" (stateless)" if extra else "")
+        print(f"{label:<28} {result['connect_ms']:>8.1f}ms {result['call_ms']:>7.1f}ms "
+              f"{result['sessions']:>9} {result['kb_per_session']:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,70 +5,99 @@ Run this alongside your Streamlit app to enable MCP functionality
 """
 
 import asyncio
-import httpx
 import os
+import time
 from dotenv import load_dotenv
 
+from weather_core.deadlines import deadline_scope
+from weather_core.fanout import gather_limited
+from weather_core.intents import extract
+from weather_core.models import Forecast, Observation
+from weather_core.providers import providers_from_env
+from weather_core.repl import LineReader, Prefetcher
+from weather_core.schema import render_comparison_text, weather_report
+
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv('OPENWEATHER_API_KEY')
+QUESTION_DEADLINE_S = float(os.getenv('WEATHER_QUESTION_DEADLINE_S', '15'))
 
 class WeatherMCPClient:
     def __init__(self):
         self.api_key = API_KEY
-        self.base_url = "https://api.openweathermap.org/data/2.5"
+        self.providers = providers_from_env(self.api_key)
+        # Fetches started while the question is still being typed
+        self.prefetcher = Prefetcher({"weather": self._fetch_current, "forecast": self._fetch_forecast})
         
+    async def _fetch_current(self, city: str) -> Observation:
+        data = await self.providers.current(city)
+        if data is None:
+            raise RuntimeError(f"no weather provider answered ({', '.join(self.providers.names)})")
+        return data
+    
+    async def _fetch_forecast(self, city: str) -> Forecast:
+        data = await self.providers.forecast(city)
+        if data is None:
+            raise RuntimeError(f"no weather provider answered ({', '.join(self.providers.names)})")
+        return data
+    
+    async def get_weather_data(self, city: str) -> Observation:
+        """Fetch normalized current weather for a city, reusing a prefetch if one is in flight"""
+        return await self.prefetcher.get("weather", city)
+    
     async def get_weather(self, city: str) -> str:
         """Get current weather for an Indian city"""
-        url = f"{self.base_url}/weather?q={city},IN&appid={self.api_key}&units=metric"
-        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                
-                weather = data['weather'][0]['description'].title()
-                temp = data['main']['temp']
-                feels_like = data['main']['feels_like']
-                humidity = data['main']['humidity']
-                wind = data['wind']['speed']
-                
-                return (
-                    f"Weather in {city}:\n"
-                    f"Temperature: {temp} °C\n"
-                    f"Feels Like: {feels_like} °C\n"
-                    f"Condition: {weather}\n"
-                    f"Humidity: {humidity}%\n"
-                    f"Wind Speed: {wind} m/s"
-                )
+            data = await self.get_weather_data(city)
+            weather = data.condition.title()
+            temp = data.temp_c
+            feels_like = data.feels_like_c
+            humidity = data.humidity_pct
+            wind = data.wind_mps
+            
+            return (
+                f"Weather in {city}:\n"
+                f"Temperature: {temp} °C\n"
+                f"Feels Like: {feels_like} °C\n"
+                f"Condition: {weather}\n"
+                f"Humidity: {humidity}%\n"
+                f"Wind Speed: {wind} m/s"
+            )
         except Exception as e:
             return f"Error fetching weather for {city}: {str(e)}"
     
+    async def compare_weather(self, cities: list[str]) -> str:
+        """Current weather for several cities, fetched concurrently, as one comparison"""
+        async def fetch(city):
+            try:
+                return await self.get_weather_data(city)
+            except Exception:
+                return None
+        
+        results = await gather_limited(fetch, cities)
+        reports = [weather_report(city, data) for city, data in zip(cities, results) if data]
+        missing = [city for city, data in zip(cities, results) if not data]
+        return "Weather comparison:\n" + render_comparison_text(reports, missing)
+    
     async def get_forecast(self, city: str) -> str:
         """Get 5-day forecast for a city"""
-        url = f"{self.base_url}/forecast?q={city},IN&appid={self.api_key}&units=metric"
-        
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, timeout=10.0)
-                response.raise_for_status()
-                data = response.json()
-                
-                forecasts = []
-                for item in data['list'][:8]:  # First 24 hours (3-hour intervals)
-                    dt = item['dt_txt']
-                    temp = item['main']['temp']
-                    weather = item['weather'][0]['description']
-                    forecasts.append(f"{dt}: {temp}°C, {weather}")
-                
-                return f"24-hour forecast for {city}:\n" + "\n".join(forecasts)
+            data = await self.prefetcher.get("forecast", city)
+            
+            forecasts = []
+            for item in data.points[:8]:  # First 24 hours (3-hour intervals)
+                dt = item.dt_txt
+                temp = item.temp_c
+                weather = item.condition
+                forecasts.append(f"{dt}: {temp}°C, {weather}")
+            
+            return f"24-hour forecast for {city}:\n" + "\n".join(forecasts)
         except Exception as e:
             return f"Error fetching forecast for {city}: {str(e)}"
 
-async def interactive_chat():
+async def interactive_chat(client: WeatherMCPClient):
     """Interactive chat interface for weather queries"""
-    client = WeatherMCPClient()
+    reader = LineReader(on_change=client.prefetcher.on_change)
     
     print("🤖 Weather AI Assistant")
     print("=" * 40)
@@ -78,7 +107,7 @@ async def interactive_chat():
     
     while True:
         try:
-            user_input = input("You: ").strip()
+            user_input = (await reader.readline("You: ")).strip()
             
             if user_input.lower() in ['quit', 'exit', 'bye']:
                 print("Goodbye! 👋")
@@ -87,12 +116,13 @@ async def interactive_chat():
             if not user_input:
                 continue
             
-            # Process the question
-            response = await process_weather_question(client, user_input)
+            # Process the question; fetches and retries share one time budget
+            with deadline_scope(time.monotonic() + QUESTION_DEADLINE_S):
+                response = await process_weather_question(client, user_input)
             print(f"AI: {response}")
             print()
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             print("\nGoodbye! 👋")
             break
         except Exception as e:
@@ -100,20 +130,18 @@ async def interactive_chat():
 
 async def process_weather_question(client: WeatherMCPClient, question: str) -> str:
     """Process user questions and return appropriate responses"""
-    question_lower = question.lower()
+    found = extract(question)
     
-    # Check for specific cities
-    cities = ["delhi", "mumbai", "bangalore", "chennai", "kolkata", "hyderabad", "pune", "ahmedabad", "jaipur", "lucknow"]
-    
-    for city in cities:
-        if city in question_lower:
-            if "forecast" in question_lower:
-                return await client.get_forecast(city.title())
-            else:
-                return await client.get_weather(city.title())
+    # Answer for every city mentioned, fetching them concurrently
+    if len(found.cities) > 1 and "forecast" not in found.intents:
+        return await client.compare_weather(list(found.cities))
+    if found.cities:
+        fetch = client.get_forecast if "forecast" in found.intents else client.get_weather
+        answers = await gather_limited(fetch, found.cities)
+        return "\n\n".join(answers)
     
     # General responses
-    if "help" in question_lower or "what can you do" in question_lower:
+    if "help" in found.intents:
         return """I can help you with weather information for Indian cities!
 
 🌤️ What I can do:
@@ -132,10 +160,10 @@ async def process_weather_question(client: WeatherMCPClient, question: str) -> s
 • "Temperature in Bangalore"
 • "How's the weather in Chennai?" """
     
-    elif "temperature" in question_lower:
+    elif "temperature" in found.intents:
         return "I can help with temperature information! Try asking about a specific city like 'What's the temperature in Delhi?'"
     
-    elif "forecast" in question_lower:
+    elif "forecast" in found.intents:
         return "I can provide weather forecasts! Try asking 'What's the forecast for Mumbai?' or '5-day forecast for Delhi'"
     
     else:
@@ -152,18 +180,25 @@ def main():
     """Main function"""
     print("Starting Weather MCP Client...")
     
-    if not API_KEY:
-        print("❌ Error: OPENWEATHER_API_KEY not found in .env file")
-        print("Please create a .env file with your API key:")
-        print("OPENWEATHER_API_KEY=your_api_key_here")
+    if API_KEY:
+        print("✅ API key loaded successfully")
+    else:
+        # Open-Meteo and cassette replay need no key; only OpenWeatherMap is skipped
+        print("⚠️ OPENWEATHER_API_KEY not found in .env file; using the providers that need none")
+    
+    try:
+        client = WeatherMCPClient()
+    except ValueError as e:
+        print(f"❌ Error: no usable weather provider: {e}")
+        print("Check WEATHER_PROVIDERS (owm, open-meteo, local) in your .env file")
         return
     
-    print("✅ API key loaded successfully")
+    print(f"🌐 Weather providers: {', '.join(client.providers.names)}")
     print("Starting interactive chat...")
     print()
     
     # Run the interactive chat
-    asyncio.run(interactive_chat())
+    asyncio.run(interactive_chat(client))
 
 if __name__ == "__main__":
     main()
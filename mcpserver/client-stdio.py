@@ -23,8 +23,8 @@ async def main():
                 print(f"  - {tool.name}: {tool.description}")
 
               # Call our Weather Tool
-            result = await session.call_tool("get_alerts", arguments={"state":"CA"})
-            print(f"The weather alerts are = {result.content[0].text}")
+            result = await session.call_tool("get_alerts", arguments={"city": "Delhi", "include_text": True})
+            print(f"The weather alerts are = {result.structuredContent['text']}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+Multi-worker mode for the weather MCP server.
+
+Runs N copies of ``server.py`` on private loopback ports and a small TCP proxy
+on the public port. The proxy keeps every MCP session on the worker that
+created it: it learns session ids from the first bytes each worker sends
+back (the SSE ``endpoint`` event or the ``mcp-session-id`` header) and routes
+later requests carrying that id to the same worker. Workers share their
+observation cache, rate limiter and prefetch schedule through one SQLite
+store, so adding workers does not multiply upstream traffic.
+
+Connections are pinned to a worker by their first request; MCP clients open
+one connection pool per session, so keep-alive reuse stays on that session.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import signal
+import socket
+import sys
+import tempfile
+from collections import OrderedDict
+
+logger = logging.getLogger("weather.cluster")
+
+# SSE carries the id as ?session_id=..., streamable HTTP as an mcp-session-id header
+_SESSION_ID = re.compile(rb"session_id=([0-9a-fA-F-]+)|\r\nmcp-session-id:\s*([^\r\n]+)", re.IGNORECASE)
+SNIFF_BYTES = 16 * 1024
+MAX_SESSIONS = 10_000
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StickyProxy:
+    """Session-affine TCP proxy in front of the worker processes."""
+
+    def __init__(self, workers: list[tuple[str, int]]):
+        self.workers = workers
+        self.active = [0] * len(workers)
+        self.sessions = OrderedDict()  # session id -> worker index
+
+    def pick(self, head: bytes) -> int:
+        match = _SESSION_ID.search(head)
+        if match:
+            session_id = (match.group(1) or match.group(2)).strip()
+            if session_id in self.sessions:
+                self.sessions.move_to_end(session_id)
+                return self.sessions[session_id]
+        # New session: least busy worker
+        return min(range(len(self.workers)), key=self.active.__getitem__)
+
+    def remember(self, session_id: bytes, index: int) -> None:
+        self.sessions[session_id] = index
+        self.sessions.move_to_end(session_id)
+        while len(self.sessions) > MAX_SESSIONS:
+            self.sessions.popitem(last=False)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        index = self.pick(head)
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(*self.workers[index])
+        except OSError:
+            logger.warning("Worker %d unreachable", index)
+            writer.close()
+            return
+        self.active[index] += 1
+        learned = []
+        try:
+            upstream_writer.write(head)
+            await asyncio.gather(
+                self._pipe(reader, upstream_writer),
+                self._pipe_back(upstream_reader, writer, index, learned),
+            )
+        finally:
+            self.active[index] -= 1
+            if head.startswith(b"GET"):
+                # An SSE stream owns its session; forget it once the stream closes
+                for session_id in learned:
+                    self.sessions.pop(session_id, None)
+
+    async def _pipe(self, reader, writer) -> None:
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _pipe_back(self, reader, writer, index: int, learned: list) -> None:
+        sniffed = b""
+        try:
+            while data := await reader.read(65536):
+                if sniffed is not None:
+                    sniffed += data
+                    match = _SESSION_ID.search(sniffed)
+                    if match:
+                        session_id = (match.group(1) or match.group(2)).strip()
+                        self.remember(session_id, index)
+                        learned.append(session_id)
+                        sniffed = None
+                    elif len(sniffed) > SNIFF_BYTES:
+                        sniffed = None
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def _run(script: str, workers: int, host: str, port: int, store_path: str, worker_args: list[str]) -> None:
+    ports = [free_port() for _ in range(workers)]
+    env = dict(os.environ, WEATHER_STORE=store_path)
+    processes = [
+        await asyncio.create_subprocess_exec(
+            sys.executable, script, "--host", "127.0.0.1", "--port", str(worker_port), "--workers", "1",
+            *worker_args, env=env,
+        )
+        for worker_port in ports
+    ]
+    try:
+        # Shut the workers down with us instead of orphaning them
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:  # Windows
+        pass
+    proxy = StickyProxy([("127.0.0.1", worker_port) for worker_port in ports])
+    server = await asyncio.start_server(proxy.handle, host, port, limit=SNIFF_BYTES * 4)
+    print(f"Running {workers} workers behind {host}:{port} (shared store: {store_path})")
+    try:
+        async with server:
+            # Stop when any worker exits so the process manager restarts the whole cluster
+            await asyncio.wait([asyncio.create_task(p.wait()) for p in processes], return_when=asyncio.FIRST_COMPLETED)
+            logger.error("A worker exited; shutting down the cluster")
+    finally:
+        for process in processes:
+            if process.returncode is None:
+                process.terminate()
+        await asyncio.gather(*(p.wait() for p in processes))
+
+
+def run_cluster(script: str, workers: int, host: str, port: int, store_path: str | None = None,
+                worker_args: list[str] | None = None) -> None:
+    """Serve ``script`` from ``workers`` processes behind ``host:port``."""
+    store_path = store_path or os.path.join(tempfile.gettempdir(), f"weather-mcp-{port}.db")
+    try:
+        asyncio.run(_run(script, workers, host, port, store_path, worker_args or []))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
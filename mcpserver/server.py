@@ -1,8 +1,46 @@
 
+import argparse
+import asyncio
+import contextvars
+import json
 import os
-import httpx
+import socket
+import sys
+import time
+import weakref
+from pathlib import Path
+
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from pydantic import AnyUrl
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+# Allow `python mcpserver/server.py` to import the shared weather_core package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weather_core.admission import AdmissionController, Overloaded
+from weather_core.alerts import AlertConfig, AlertEngine
+from weather_core.cities import INDIAN_CITIES
+from weather_core.deadlines import deadline_scope, timeout_from_meta
+from weather_core.metrics import metrics
+from weather_core.models import Forecast, Observation
+from weather_core.providers import providers_from_env
+from weather_core.schema import (
+    AlertsReport,
+    CitySnapshot,
+    ForecastReport,
+    WeatherReport,
+    city_snapshot,
+    forecast_report,
+    render_alerts_text,
+    render_forecast_text,
+    render_snapshot_text,
+    render_weather_text,
+    weather_report,
+)
+from weather_core.store import open_store
 
 # Create an MCP server
 mcp = FastMCP(
@@ -15,101 +53,382 @@ mcp = FastMCP(
 load_dotenv()
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
 
-# List of popular Indian cities
-INDIAN_CITIES = [
-    "Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Jaipur", "Lucknow",
-    "Chandigarh", "Bhopal", "Indore", "Patna", "Nagpur", "Kanpur", "Thiruvananthapuram", "Coimbatore", "Vadodara", "Surat"
-]
+# Weather backends (OWM, Open-Meteo, ...) tried fastest first, see weather_core.providers
+providers = providers_from_env(API_KEY)
+
+async def fetch_weather(city: str) -> Observation | None:
+    return await providers.current(city)
+
+async def fetch_forecast(city: str) -> Forecast | None:
+    return await providers.forecast(city)
+
+# Observation cache, upstream rate limit and prefetch schedule; shared between
+# workers when WEATHER_STORE points at a SQLite file
+store = open_store()
+CACHE_TTL_S = {"weather": 600, "forecast": 1800}  # OWM refreshes ~every 10 minutes
+UPSTREAM_RPM = int(os.getenv("WEATHER_UPSTREAM_RPM", "60"))  # OWM free tier limit
+HOT_WINDOW_S = 3600  # keep prefetching a city for an hour after it was last asked for
+REFRESH_INTERVAL_S = 5.0
+FETCHERS = {"weather": fetch_weather, "forecast": fetch_forecast}
+_inflight = {}
+
+# Threshold alerts over all cached forecasts, updated on every forecast refresh
+alert_engine = AlertEngine(INDIAN_CITIES, AlertConfig.from_env())
+_alerts_synced = {}  # city -> fetched_at of the forecast the engine last saw
+
+async def refresh(kind: str, city: str) -> Observation | Forecast | None:
+    """Fetch from upstream within the shared rate limit and update the cache."""
+    if not await asyncio.to_thread(store.acquire, "owm", UPSTREAM_RPM / 60, UPSTREAM_RPM):
+        metrics.incr("upstream.rate_limited")
+        return None
+    metrics.incr("upstream.requests")
+    data = await FETCHERS[kind](city)
+    if data is not None:
+        # An unchanged payload only extends the cache entry; nothing to re-evaluate
+        changed = await asyncio.to_thread(store.put_if_changed, f"{kind}:{city}", data, CACHE_TTL_S[kind])
+        if not changed:
+            metrics.incr("cache.unchanged")
+        elif kind == "forecast":
+            alert_engine.update(city, data)
+    return data
+
+async def shared_refresh(kind: str, city: str) -> Observation | Forecast | None:
+    """refresh() under the server's own deadline, for a fetch every concurrent caller waits on."""
+    with deadline_scope(time.monotonic() + admission.deadline_s):
+        return await refresh(kind, city)
+
+async def cached_fetch(kind: str, city: str) -> Observation | Forecast | None:
+    """Return cached data when fresh, otherwise fetch once for all concurrent callers."""
+    key = f"{kind}:{city}"
+    now = time.time()
+    entry = await asyncio.to_thread(store.get, key)
+    await asyncio.to_thread(store.mark_hot, key, now + CACHE_TTL_S[kind] * 0.9, now + HOT_WINDOW_S)
+    if entry and entry.fresh:
+        metrics.incr("cache.hit")
+        return entry.value
+    metrics.incr("cache.miss")
+    if key not in _inflight:
+        # A fresh context, so the fetch isn't bound by the deadline of whichever caller started it;
+        # each caller still stops waiting at its own deadline
+        _inflight[key] = asyncio.create_task(shared_refresh(kind, city), context=contextvars.Context())
+        _inflight[key].add_done_callback(lambda _: _inflight.pop(key, None))
+    data = await asyncio.shield(_inflight[key])
+    # A stale answer beats no answer when upstream fails or we are rate limited
+    return data if data is not None else (entry.value if entry else None)
+
+# Cap on concurrent tool calls, with a bounded wait queue and per-call deadlines
+admission = AdmissionController.from_env()
+
+def requested_timeout() -> float | None:
+    """The time budget the client gave this tool call (``timeout_ms`` in the request ``_meta``)."""
+    try:
+        return timeout_from_meta(mcp.get_context().request_context.meta)
+    except ValueError:  # not inside a request
+        return None
+
+async def admitted_fetch_all(keys: list[tuple[str, str]]) -> list[Observation | Forecast | None]:
+    """cached_fetch of several (kind, city) keys for one tool call, concurrently and under admission control.
 
-async def fetch_weather(city: str) -> dict:
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city},IN&appid={API_KEY}&units=metric"
-    async with httpx.AsyncClient() as client:
+    The call takes one admission slot however many keys it fetches. A call
+    that is shed or runs past its deadline gets the last cached values,
+    however old, or a ToolError when none of them is cached. The deadline
+    also bounds the upstream fetches and their retries.
+    """
+    try:
+        async with admission.admit(requested_timeout()) as deadline:
+            with deadline_scope(deadline):
+                async with asyncio.timeout_at(deadline):
+                    return list(await asyncio.gather(*(cached_fetch(kind, city) for kind, city in keys)))
+    except (Overloaded, TimeoutError) as e:
+        reason = str(e) or "deadline exceeded"
+        if isinstance(e, TimeoutError):
+            metrics.incr("admission.deadline_exceeded")
+        entries = [await asyncio.to_thread(store.get, f"{kind}:{city}") for kind, city in keys]
+        if any(entries):
+            metrics.incr("admission.stale_served")
+            return [entry.value if entry else None for entry in entries]
+        raise ToolError(f"Server is busy ({reason}), please retry shortly.") from None
+
+async def admitted_fetch(kind: str, city: str) -> Observation | Forecast | None:
+    """cached_fetch for one tool call, under admission control; see admitted_fetch_all."""
+    return (await admitted_fetch_all([(kind, city)]))[0]
+
+async def refresh_loop() -> None:
+    """Refresh hot cities shortly before their cache entries expire.
+
+    Due entries are leased through the store, so with several workers each
+    city is refreshed by exactly one of them.
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    while True:
         try:
-            response = await client.get(url, timeout=20.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+            for key in await asyncio.to_thread(store.claim_due, owner, 5, 30.0):
+                kind, city = key.split(":", 1)
+                await refresh(kind, city)
+                await asyncio.to_thread(store.reschedule, key, time.time() + CACHE_TTL_S[kind] * 0.9)
+        except Exception as e:
+            print(f"Prefetch error: {e}", file=sys.stderr)
+        await asyncio.sleep(REFRESH_INTERVAL_S)
+
+def check_city(city: str) -> None:
+    if city not in INDIAN_CITIES:
+        raise ToolError(f"City '{city}' is not supported. Choose from: {', '.join(INDIAN_CITIES)}")
 
 @mcp.tool()
-async def get_weather(city: str) -> str:
+async def get_weather(city: str, include_text: bool = False) -> WeatherReport:
     """Get current weather for an Indian city.
     Args:
         city: Name of the city (e.g. Delhi)
+        include_text: Also return a human-readable summary in `text`
     """
-    if city not in INDIAN_CITIES:
-        return f"City '{city}' is not supported. Choose from: {', '.join(INDIAN_CITIES)}"
-    data = await fetch_weather(city)
-    if not data or "main" not in data:
-        return "Unable to fetch weather data."
-    weather = data['weather'][0]['description'].title()
-    temp = data['main']['temp']
-    feels_like = data['main']['feels_like']
-    humidity = data['main']['humidity']
-    wind = data['wind']['speed']
-    return (
-        f"Weather in {city}:\n"
-        f"Temperature: {temp} °C\n"
-        f"Feels Like: {feels_like} °C\n"
-        f"Condition: {weather}\n"
-        f"Humidity: {humidity}%\n"
-        f"Wind Speed: {wind} m/s"
-    )
-    data = await make_nws_request(url)
-
-    if not data or "features" not in data:
-        return "Unable to fetch alerts or no alerts found."
-
-    if not data["features"]:
-        return "No active alerts for this state."
-
-    alerts = [format_alert(feature) for feature in data["features"]]
-    return "\n---\n".join(alerts)
+    check_city(city)
+    data = await admitted_fetch("weather", city)
+    if data is None:
+        raise ToolError("Unable to fetch weather data.")
+    report = weather_report(city, data)
+    if include_text:
+        report["text"] = render_weather_text(report)
+    return report
+
+@mcp.tool()
+async def get_forecast(city: str, hours: int = 24, include_text: bool = False) -> ForecastReport:
+    """Get the 3-hourly weather forecast for an Indian city.
+
+    Args:
+        city: Name of the city (e.g. Delhi)
+        hours: How far ahead to forecast, up to 120 hours
+        include_text: Also return a human-readable summary in `text`
+    """
+    check_city(city)
+    data = await admitted_fetch("forecast", city)
+    if data is None:
+        raise ToolError("Unable to fetch forecast data.")
+    report = forecast_report(city, data, hours=min(hours, 120))
+    if include_text:
+        report["text"] = render_forecast_text(report)
+    return report
 
 @mcp.tool()
-async def get_forecast(latitude: float, longitude: float) -> str:
-    """Get weather forecast for a location.
+async def get_snapshot(city: str, hours: int = 12, include_text: bool = False) -> CitySnapshot:
+    """Get current weather and a forecast summary for an Indian city in one call.
+
+    Use this for questions about both now and later (e.g. "what's it like in
+    Pune now and later today?") instead of calling get_weather and get_forecast.
+
+    Args:
+        city: Name of the city (e.g. Delhi)
+        hours: How far ahead to summarize the forecast, up to 120 hours
+        include_text: Also return a human-readable summary in `text`
+    """
+    check_city(city)
+    current, forecast = await admitted_fetch_all([("weather", city), ("forecast", city)])
+    if current is None and forecast is None:
+        raise ToolError("Unable to fetch weather data.")
+    snapshot = city_snapshot(city, current, forecast, hours=min(hours, 120))
+    if include_text:
+        snapshot["text"] = render_snapshot_text(snapshot)
+    return snapshot
+
+async def current_alerts(city: str | None = None) -> AlertsReport:
+    """Bring the alert engine up to date with the cached forecasts and report."""
+    cities = [city] if city else INDIAN_CITIES
+    forecasts = await asyncio.gather(*(cached_fetch("forecast", c) for c in cities))
+    alert_engine.update_many({c: data for c, data in zip(cities, forecasts) if data})
+    return AlertsReport(alerts=alert_engine.alerts(city))
+
+async def sync_alerts() -> None:
+    """Feed the alert engine forecasts that other workers refreshed."""
+    updated = {}
+    for city in INDIAN_CITIES:
+        entry = await asyncio.to_thread(store.get, f"forecast:{city}")
+        if entry and entry.fetched_at != _alerts_synced.get(city):
+            _alerts_synced[city] = entry.fetched_at
+            updated[city] = entry.value
+    if updated:
+        alert_engine.update_many(updated)
+
+@mcp.tool()
+async def get_alerts(city: str | None = None, include_text: bool = False) -> AlertsReport:
+    """Get active heat, wind, heavy rain and sudden temperature drop alerts from the forecasts.
 
     Args:
-        latitude: Latitude of the location
-        longitude: Longitude of the location
+        city: Only alerts for this city (e.g. Delhi); all cities when omitted
+        include_text: Also return a human-readable summary in `text`
+    """
+    if city is not None:
+        check_city(city)
+    try:
+        async with admission.admit(requested_timeout()) as deadline:
+            with deadline_scope(deadline):
+                async with asyncio.timeout_at(deadline):
+                    report = await current_alerts(city)
+    except (Overloaded, TimeoutError):
+        # Answer from the forecasts the engine already has
+        metrics.incr("admission.stale_served")
+        report = AlertsReport(alerts=alert_engine.alerts(city))
+    if include_text:
+        report["text"] = render_alerts_text(report)
+    return report
+
+# Subscriptions: uri -> {session: last version it saw}. The version of
+# weather://{city} is the observation dt; of alerts://india, the alert set version.
+_subscribers: dict[str, weakref.WeakKeyDictionary] = {}
+ALERTS_URI = "alerts://india"
+
+@mcp.resource("weather://{city}", mime_type="application/json")
+async def city_weather(city: str) -> str:
+    """Current weather for an Indian city. Subscribe to be notified of new observations."""
+    if city not in INDIAN_CITIES:
+        raise ValueError(f"City '{city}' is not supported")
+    data = await admitted_fetch("weather", city)
+    if data is None:
+        raise ValueError("Unable to fetch weather data.")
+    report = weather_report(city, data)
+    report["text"] = render_weather_text(report)
+    return json.dumps(report)
+
+@mcp.resource(ALERTS_URI, mime_type="application/json")
+async def alerts_resource() -> str:
+    """Active weather alerts for all cities. Subscribe to be notified when they change."""
+    report = await current_alerts()
+    report["text"] = render_alerts_text(report)
+    return json.dumps(report)
+
+async def resource_version(uri: str):
+    if uri == ALERTS_URI:
+        return alert_engine.version
+    entry = await asyncio.to_thread(store.get, f"weather:{uri.removeprefix('weather://')}")
+    return entry.value.dt if entry else None
+
+@mcp._mcp_server.subscribe_resource()
+async def subscribe(uri) -> None:
+    uri = str(uri)
+    if uri != ALERTS_URI and not (uri.startswith("weather://") and uri.removeprefix("weather://") in INDIAN_CITIES):
+        raise ValueError(f"Cannot subscribe to {uri}")
+    sessions = _subscribers.setdefault(uri, weakref.WeakKeyDictionary())
+    sessions[mcp.get_context().session] = await resource_version(uri)
+    metrics.gauge("resource.subscriptions", sum(len(s) for s in _subscribers.values()))
+
+@mcp._mcp_server.unsubscribe_resource()
+async def unsubscribe(uri) -> None:
+    _subscribers.get(str(uri), {}).pop(mcp.get_context().session, None)
+    metrics.gauge("resource.subscriptions", sum(len(s) for s in _subscribers.values()))
+
+# FastMCP always advertises resources.subscribe=False; we handle subscriptions
+_get_capabilities = mcp._mcp_server.get_capabilities
+
+def _get_capabilities_with_subscribe(*args, **kwargs):
+    capabilities = _get_capabilities(*args, **kwargs)
+    if capabilities.resources is not None:
+        capabilities.resources.subscribe = True
+    return capabilities
+
+mcp._mcp_server.get_capabilities = _get_capabilities_with_subscribe
+
+async def notify_loop() -> None:
+    """Send resources/updated to subscribed sessions when a resource changes.
+
+    Watches the shared store instead of hooking refresh(), so subscribers on
+    every worker hear about an observation whichever worker fetched it.
+    Subscribed cities (all forecasts, for alerts) are kept on the prefetch
+    schedule.
     """
-    # First get the forecast grid endpoint
-    points_url = f"{NWS_API_BASE}/points/{latitude},{longitude}"
-    points_data = await make_nws_request(points_url)
-
-    if not points_data:
-        return "Unable to fetch forecast data for this location."
-
-    # Get the forecast URL from the points response
-    forecast_url = points_data["properties"]["forecast"]
-    forecast_data = await make_nws_request(forecast_url)
-
-    if not forecast_data:
-        return "Unable to fetch detailed forecast."
-
-    # Format the periods into a readable forecast
-    periods = forecast_data["properties"]["periods"]
-    forecasts = []
-    for period in periods[:5]:  # Only show next 5 periods
-        forecast = f"""
-                {period['name']}:
-                Temperature: {period['temperature']}°{period['temperatureUnit']}
-                Wind: {period['windSpeed']} {period['windDirection']}
-                Forecast: {period['detailedForecast']}
-                """
-        forecasts.append(forecast)
-
-    return "\n---\n".join(forecasts)
+    while True:
+        try:
+            now = time.time()
+            if _subscribers.get(ALERTS_URI):
+                await sync_alerts()
+            for uri, sessions in list(_subscribers.items()):
+                if not sessions:
+                    del _subscribers[uri]
+                    continue
+                if uri == ALERTS_URI:
+                    keys = [f"forecast:{city}" for city in INDIAN_CITIES]
+                else:
+                    keys = [f"weather:{uri.removeprefix('weather://')}"]
+                for key in keys:
+                    await asyncio.to_thread(store.mark_hot, key, now, now + HOT_WINDOW_S)
+                version = await resource_version(uri)
+                if version is None:
+                    continue
+                for session, seen in list(sessions.items()):
+                    if seen == version:
+                        continue
+                    sessions[session] = version
+                    try:
+                        await session.send_resource_updated(AnyUrl(uri))
+                        metrics.incr("resource.notifications")
+                    except Exception:
+                        sessions.pop(session, None)  # the client has gone away
+        except Exception as e:
+            print(f"Notify error: {e}", file=sys.stderr)
+        await asyncio.sleep(REFRESH_INTERVAL_S)
+
+@mcp.custom_route("/health", methods=["GET"])
+async def health(request: Request) -> JSONResponse:
+    """Readiness probe for launchers and supervisors."""
+    return JSONResponse({"status": "ok", "pid": os.getpid()})
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_route(request: Request) -> JSONResponse:
+    """This worker's counters, gauges (admission queue depth, in-flight calls) and latencies."""
+    return JSONResponse(metrics.snapshot())
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+async def serve(transport: str) -> None:
+    """Run the MCP server together with the background prefetcher and notifier."""
+    refresher = asyncio.create_task(refresh_loop())
+    notifier = asyncio.create_task(notify_loop())
+    try:
+        if transport == "stdio":
+            await mcp.run_stdio_async()
+        elif transport == "sse":
+            await mcp.run_sse_async()
+        else:
+            await mcp.run_streamable_http_async()
+    finally:
+        refresher.cancel()
+        notifier.cancel()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="India weather MCP server")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=os.getenv("WEATHER_MCP_TRANSPORT", "sse"))
+    parser.add_argument("--host", default=os.getenv("WEATHER_MCP_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("WEATHER_MCP_PORT", "8000")))
+    parser.add_argument("--stateless", action="store_true",
+                        default=os.getenv("WEATHER_MCP_STATELESS", "").lower() in ("1", "true", "yes"),
+                        help="Streamable HTTP only: no server-side session, one request/response per call")
+    parser.add_argument("--json-response", action="store_true",
+                        help="Streamable HTTP only: answer with plain JSON instead of an SSE stream")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEATHER_MCP_WORKERS", "1")),
+                        help="Number of server processes behind the port")
+    parser.add_argument("--store", default=os.getenv("WEATHER_STORE"),
+                        help="SQLite file for the cache shared between workers")
+    return parser.parse_args()
 
 # Run the server
 if __name__ == "__main__":
-    transport = "sse"
+    args = parse_args()
+    transport = args.transport
+    if args.workers > 1:
+        if transport == "stdio":
+            raise ValueError("--workers needs a network transport (sse or streamable-http)")
+        from mcpserver.cluster import run_cluster
+        worker_args = ["--transport", transport]
+        worker_args += ["--stateless"] if args.stateless else []
+        worker_args += ["--json-response"] if args.json_response else []
+        run_cluster(__file__, args.workers, args.host, args.port, args.store, worker_args)
+        sys.exit(0)
+    if args.store:
+        store = open_store(args.store)
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    mcp.settings.stateless_http = args.stateless
+    mcp.settings.json_response = args.json_response
+    # Log to stderr: stdout carries the protocol in stdio mode
     if transport == "stdio":
-        print("Running server with stdio transport")
-        mcp.run(transport="stdio")
-    elif transport == "sse":
-        print("Running server with SSE transport")
-        mcp.run(transport="sse")
+        print("Running server with stdio transport", file=sys.stderr)
     else:
-        raise ValueError(f"Unknown transport: {transport}")
\ No newline at end of file
+        print(f"Running server with {transport} transport on {args.host}:{args.port}", file=sys.stderr)
+    asyncio.run(serve(transport))
\ No newline at end of file
@@ -4,6 +4,7 @@ Automation script for India Weather Streamlit App
 This script handles the deployment and automation of the weather app
 """
 
+import asyncio
 import subprocess
 import sys
 import os
@@ -14,6 +15,10 @@ from pathlib import Path
 import webbrowser
 import platform
 
+from weather_core.metrics import metrics
+from weather_core.readiness import Service, missing_distributions, wait_until_ready
+from weather_core.supervisor import ServiceSpec, Supervisor
+
 # Configure logging with UTF-8 encoding for Windows compatibility
 if platform.system() == "Windows":
     logging.basicConfig(
@@ -39,9 +44,13 @@ class WeatherAppAutomation:
     
     def __init__(self):
         self.process = None
+        self.mcp_process = None
         self.app_port = 8501
         self.app_host = "localhost"
         self.app_url = f"http://{self.app_host}:{self.app_port}"
+        self.mcp_port = 8000
+        self.with_mcp = True
+        self.ready_timeout = 60
         
     def check_dependencies(self):
         """Check if all required dependencies are installed"""
@@ -52,20 +61,21 @@ class WeatherAppAutomation:
             'requests',
             'pandas',
             'plotly',
-            'folium',
-            'streamlit-folium',
+            'httpx',
+            'msgspec',
             'python-dotenv'
         ]
+        if self.with_mcp:
+            required_packages.append('mcp')
         
-        missing_packages = []
+        # Look packages up in the installed metadata; importing them would cost seconds
+        missing_packages = missing_distributions(required_packages)
         
         for package in required_packages:
-            try:
-                __import__(package.replace('-', '_'))
-                logging.info(f"[OK] {package} is installed")
-            except ImportError:
-                missing_packages.append(package)
+            if package in missing_packages:
                 logging.warning(f"[MISSING] {package} is missing")
+            else:
+                logging.info(f"[OK] {package} is installed")
         
         if missing_packages:
             logging.error(f"Missing packages: {', '.join(missing_packages)}")
@@ -131,38 +141,68 @@ class WeatherAppAutomation:
         
         return False
     
+    def _launch(self, name, command, env=None):
+        """Start a service with its output going to <name>.log"""
+        log = open(f"{name}.log", "w", encoding="utf-8")
+        try:
+            return subprocess.Popen(command, env=env, stdout=log, stderr=subprocess.STDOUT, text=True)
+        finally:
+            log.close()  # the child keeps its own handle
+    
+    def _log_tail(self, name, lines=20):
+        """Last lines a service wrote, for error reports"""
+        try:
+            with open(f"{name}.log", encoding="utf-8", errors="replace") as f:
+                return "".join(f.readlines()[-lines:])
+        except OSError:
+            return ""
+    
+    def _streamlit_env(self):
+        """Environment for Streamlit: headless, bound to the configured host and port"""
+        env = os.environ.copy()
+        env['STREAMLIT_SERVER_PORT'] = str(self.app_port)
+        env['STREAMLIT_SERVER_ADDRESS'] = self.app_host
+        env['STREAMLIT_SERVER_HEADLESS'] = 'true'
+        env['STREAMLIT_BROWSER_GATHER_USAGE_STATS'] = 'false'
+        return env
+    
     def start_app(self):
-        """Start the Streamlit app"""
+        """Start the MCP server and the Streamlit app and wait until both answer"""
         logging.info("Starting India Weather App...")
         
         try:
-            # Set Streamlit configuration
-            env = os.environ.copy()
-            env['STREAMLIT_SERVER_PORT'] = str(self.app_port)
-            env['STREAMLIT_SERVER_ADDRESS'] = self.app_host
-            env['STREAMLIT_SERVER_HEADLESS'] = 'true'
-            env['STREAMLIT_BROWSER_GATHER_USAGE_STATS'] = 'false'
+            services = []
             
-            # Start the app
-            self.process = subprocess.Popen(
-                [sys.executable, "-m", "streamlit", "run", "india_streamlit_app.py"],
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
+            # Launch everything first so the services start up in parallel
+            if self.with_mcp and (self.mcp_process is None or self.mcp_process.poll() is not None):
+                self.mcp_process = self._launch(
+                    "mcp_server",
+                    [sys.executable, "mcpserver/server.py", "--transport", "sse", "--port", str(self.mcp_port)],
+                )
+                services.append(Service("mcp_server", f"http://localhost:{self.mcp_port}/health", self.mcp_process))
             
-            # Wait for app to start
-            time.sleep(3)
+            if self.process is None or self.process.poll() is not None:
+                self.process = self._launch(
+                    "streamlit",
+                    [sys.executable, "-m", "streamlit", "run", "india_streamlit_app.py"],
+                    env=self._streamlit_env(),
+                )
+                services.append(Service("streamlit", f"{self.app_url}/_stcore/health", self.process))
             
-            if self.process.poll() is None:
-                logging.info(f"[OK] App started successfully on {self.app_url}")
-                return True
-            else:
-                stdout, stderr = self.process.communicate()
-                logging.error(f"App failed to start: {stderr}")
-                return False
+            # Wait for the health endpoints rather than a fixed delay
+            ready = wait_until_ready(services, timeout=self.ready_timeout)
+            for name, seconds in ready.items():
+                metrics.observe(f"startup.{name}_ready_seconds", seconds)
+            logging.info(f"[OK] App started successfully on {self.app_url}")
+            return True
                 
+        except (RuntimeError, TimeoutError) as e:
+            logging.error(f"App failed to start: {e}")
+            for name in ("mcp_server", "streamlit"):
+                tail = self._log_tail(name)
+                if tail:
+                    logging.error(f"{name}.log:\n{tail}")
+            return False
         except Exception as e:
             logging.error(f"Failed to start app: {e}")
             return False
@@ -177,48 +217,89 @@ class WeatherAppAutomation:
             logging.error(f"Failed to open browser: {e}")
             return False
     
+    def _stop(self, process, name):
+        """Terminate one service, killing it if it does not exit in time"""
+        logging.info(f"Stopping {name}...")
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+            logging.info(f"[OK] {name} stopped successfully")
+        except subprocess.TimeoutExpired:
+            logging.warning(f"{name} didn't stop gracefully, forcing termination...")
+            process.kill()
+            process.wait()
+    
     def stop_app(self):
-        """Stop the Streamlit app"""
+        """Stop the Streamlit app and the MCP server"""
         if self.process:
-            logging.info("Stopping app...")
-            self.process.terminate()
-            try:
-                self.process.wait(timeout=10)
-                logging.info("[OK] App stopped successfully")
-            except subprocess.TimeoutExpired:
-                logging.warning("App didn't stop gracefully, forcing termination...")
-                self.process.kill()
-                self.process.wait()
+            self._stop(self.process, "App")
             self.process = None
+        if self.mcp_process:
+            self._stop(self.mcp_process, "MCP server")
+            self.mcp_process = None
     
-    def monitor_app(self):
-        """Monitor the app and restart if needed"""
+    def service_specs(self, replicas=1):
+        """Supervisor specs for the MCP server and the Streamlit replicas"""
+        specs = []
+        if self.with_mcp:
+            specs.append(ServiceSpec(
+                "mcp_server",
+                [sys.executable, "mcpserver/server.py", "--transport", "sse", "--port", "{port}"],
+                health_url="http://localhost:{port}/health",
+                port=self.mcp_port,
+                start_timeout_s=self.ready_timeout,
+            ))
+        specs.append(ServiceSpec(
+            "streamlit",
+            [sys.executable, "-m", "streamlit", "run", "india_streamlit_app.py", "--server.port", "{port}"],
+            health_url=f"http://{self.app_host}:{{port}}/_stcore/health",
+            port=self.app_port,
+            replicas=replicas,
+            env=self._streamlit_env(),
+            start_timeout_s=self.ready_timeout,
+        ))
+        return specs
+    
+    def monitor_app(self, auto_open=True, replicas=1, cold_start=None):
+        """Run the services under the supervisor, restarting them as needed"""
         logging.info("Starting app monitoring...")
         
-        while True:
+        try:
+            asyncio.run(self._supervise(auto_open, replicas, cold_start))
+        except KeyboardInterrupt:
+            logging.info("Received interrupt signal, shutting down...")
+        except Exception as e:
+            logging.error(f"Monitoring error: {e}")
+            return False
+        return True
+    
+    async def _supervise(self, auto_open, replicas, cold_start):
+        supervisor = Supervisor(self.service_specs(replicas))
+        try:
+            await supervisor.start()
             try:
-                if self.process and self.process.poll() is not None:
-                    logging.warning("App crashed, restarting...")
-                    self.stop_app()
-                    time.sleep(2)
-                    if not self.start_app():
-                        logging.error("Failed to restart app")
-                        break
-                
-                time.sleep(30)  # Check every 30 seconds
-                
-            except KeyboardInterrupt:
-                logging.info("Received interrupt signal, shutting down...")
-                break
-            except Exception as e:
-                logging.error(f"Monitoring error: {e}")
-                break
-        
-        self.stop_app()
+                ready = await supervisor.wait_ready(self.ready_timeout)
+            except asyncio.TimeoutError:
+                logging.warning(f"Services not ready after {self.ready_timeout:.0f}s, still supervising")
+            else:
+                for name, seconds in ready.items():
+                    metrics.observe(f"startup.{name}_ready_seconds", seconds)
+                if cold_start is not None:
+                    elapsed = time.perf_counter() - cold_start
+                    metrics.observe("startup.cold_start_seconds", elapsed)
+                    logging.info(f"Cold start to ready in {elapsed * 1000:.0f} ms")
+                logging.info(f"[OK] App started successfully on {self.app_url}")
+                if auto_open:
+                    self.open_browser()
+            logging.info("App is running under the supervisor. Press Ctrl+C to stop.")
+            await supervisor.run()
+        finally:
+            await supervisor.close()
     
-    def run(self, auto_open=True, monitor=False):
+    def run(self, auto_open=True, monitor=False, replicas=1):
         """Main run method"""
         logging.info("Starting India Weather App Automation")
+        cold_start = time.perf_counter()
         
         # Check dependencies
         if not self.check_dependencies():
@@ -229,26 +310,31 @@ class WeatherAppAutomation:
         if not self.check_api_key():
             logging.warning("API key not configured, app may not work properly")
         
+        # Under monitoring the supervisor starts the services itself
+        if monitor:
+            return self.monitor_app(auto_open, replicas, cold_start)
+        
         # Start app
         if not self.start_app():
             logging.error("Failed to start app")
+            self.stop_app()
             return False
         
+        elapsed = time.perf_counter() - cold_start
+        metrics.observe("startup.cold_start_seconds", elapsed)
+        logging.info(f"Cold start to ready in {elapsed * 1000:.0f} ms")
+        
         # Open browser
         if auto_open:
             self.open_browser()
         
-        # Monitor if requested
-        if monitor:
-            self.monitor_app()
-        else:
-            try:
-                logging.info("App is running. Press Ctrl+C to stop.")
-                while True:
-                    time.sleep(1)
-            except KeyboardInterrupt:
-                logging.info("Received interrupt signal, shutting down...")
-                self.stop_app()
+        try:
+            logging.info("App is running. Press Ctrl+C to stop.")
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            logging.info("Received interrupt signal, shutting down...")
+            self.stop_app()
         
         return True
 
@@ -259,8 +345,13 @@ def main():
     parser = argparse.ArgumentParser(description="India Weather App Automation")
     parser.add_argument("--no-browser", action="store_true", help="Don't open browser automatically")
     parser.add_argument("--monitor", action="store_true", help="Enable app monitoring and auto-restart")
+    parser.add_argument("--replicas", type=int, default=1,
+                        help="With --monitor: Streamlit processes to run, on consecutive ports from --port")
     parser.add_argument("--port", type=int, default=8501, help="Port to run the app on")
     parser.add_argument("--host", default="localhost", help="Host to run the app on")
+    parser.add_argument("--mcp-port", type=int, default=8000, help="Port to run the MCP server on")
+    parser.add_argument("--no-mcp", action="store_true", help="Don't start the MCP server")
+    parser.add_argument("--ready-timeout", type=float, default=60, help="Seconds to wait for the services to answer")
     
     args = parser.parse_args()
     
@@ -269,11 +360,15 @@ def main():
     automation.app_port = args.port
     automation.app_host = args.host
     automation.app_url = f"http://{automation.app_host}:{automation.app_port}"
+    automation.mcp_port = args.mcp_port
+    automation.with_mcp = not args.no_mcp
+    automation.ready_timeout = args.ready_timeout
     
     # Run the automation
     success = automation.run(
         auto_open=not args.no_browser,
-        monitor=args.monitor
+        monitor=args.monitor,
+        replicas=args.replicas
     )
     
     if success:
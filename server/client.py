@@ -1,11 +1,92 @@
 import asyncio
+import json
+import sys
+import time
+from pathlib import Path
 
 from dotenv import load_dotenv
+from langchain_core.messages import AIMessage, HumanMessage
 from langchain_groq import ChatGroq
 
 from mcp_use import MCPAgent, MCPClient
 import os
 
+# Allow `python server/client.py` to import the shared weather_core package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weather_core.memory import MemoryPolicy
+from weather_core.metrics import metrics
+from weather_core.agent_pool import PooledConnector
+from weather_core.pool import PoolConfig, StdioServerPool
+from weather_core.repl import LineReader, Prefetcher
+from weather_core.router import QueryRouter, RouterConfig
+from weather_core.tool_cache import ToolCache
+
+SERVER_NAME = "weather"
+
+
+async def call_tool_direct(connector, tool: str, arguments: dict) -> str:
+    """Call an MCP tool on the weather server without going through the LLM."""
+    result = await connector.call_tool(tool, arguments)
+    if result.isError:
+        raise RuntimeError(result.content[0].text if result.content else "Tool call failed")
+    structured = getattr(result, "structuredContent", None) or {}
+    if "text" in structured:
+        return structured["text"]
+    return "\n".join(block.text for block in result.content if getattr(block, "text", None))
+
+
+class Progress(str):
+    """A tool-call progress line streamed between answer tokens; not part of the answer."""
+
+
+async def stream_answer(agent: MCPAgent, get_connector, router: QueryRouter, user_input: str,
+                        prefetcher: Prefetcher | None = None):
+    """Answer one chat turn, yielding text and tool progress (``Progress``) as it arrives.
+
+    Simple lookups use the deterministic fast path (reusing the tool call the
+    prefetcher started while the question was typed); everything else streams
+    tokens and tool-call events from the agent.
+    """
+    route = router.route(user_input)
+    if route is not None:
+        start = time.perf_counter()
+        try:
+            if prefetcher is not None:
+                response = await prefetcher.get(route.tool.removeprefix("get_"), route.arguments["city"])
+            else:
+                response = await call_tool_direct(await get_connector(), route.tool, route.arguments)
+        except Exception:
+            # Fall back to the agent, which can explain the failure
+            metrics.incr("router.fast_path_error")
+        else:
+            metrics.incr("router.fast_path")
+            metrics.observe("router.fast_path_seconds", time.perf_counter() - start)
+            # Keep the agent's memory consistent with what the user saw
+            agent.add_to_history(HumanMessage(content=user_input))
+            agent.add_to_history(AIMessage(content=response))
+            yield response
+            return
+
+    metrics.incr("router.llm")
+    if not hasattr(agent, "stream_events"):
+        # Older mcp-use releases can only return the finished answer
+        yield await agent.run(user_input)
+        return
+
+    async for event in agent.stream_events(user_input):
+        kind = event.get("event")
+        if kind == "on_chat_model_stream":
+            token = event["data"]["chunk"].content
+            if token:
+                yield token
+        elif kind == "on_tool_start":
+            arguments = json.dumps(event["data"].get("input"), default=str)
+            yield Progress(f"\n[calling {event['name']} {arguments}]\n")
+        elif kind == "on_tool_end":
+            yield Progress(f"[{event['name']} done]\n")
+
+
 async def run_memory_chat():
     """Run a chat using MCPAgent's built-in conversation memory."""
     # Load environment variables for API keys
@@ -18,29 +99,81 @@ async def run_memory_chat():
 
     print("Initializing India Weather Chat...")
 
-    # Create MCP client and agent with memory enabled
-    client = MCPClient.from_config_file(config_file)
     llm = ChatGroq(model="llama3-8b-8192")
 
-    # Create agent with memory_enabled=True
-    agent = MCPAgent(
-        llm=llm,
-        client=client,
-        max_steps=15,
-        memory_enabled=True,  # Enable built-in conversation memory
-    )
+    # WEATHER_POOL_SIZE > 0 leases warm, pre-started servers instead of
+    # spawning a fresh stdio server for the session
+    pool_size = int(os.getenv("WEATHER_POOL_SIZE", "0"))
+    client = pool = connector = None
+
+    # Repeated tool calls within a conversation are answered locally while
+    # fresh (WEATHER_TOOL_CACHE, WEATHER_TOOL_CACHE_TTLS)
+    tool_cache = ToolCache.from_env()
+    if pool_size > 0:
+        pool = StdioServerPool.from_config_file(
+            config_file, SERVER_NAME,
+            PoolConfig(size=pool_size, max_calls=int(os.getenv("WEATHER_POOL_MAX_CALLS", "200"))),
+        )
+        await pool.start()
+        connector = PooledConnector(pool)
+        tool_cache.install(connector)
+        agent = MCPAgent(llm=llm, connectors=[connector], max_steps=15, memory_enabled=True)
+
+        async def get_connector():
+            await connector.connect()
+            return connector
+    else:
+        # Create MCP client and agent with memory enabled
+        client = MCPClient.from_config_file(config_file)
+
+        # Create agent with memory_enabled=True
+        agent = MCPAgent(
+            llm=llm,
+            client=client,
+            max_steps=15,
+            memory_enabled=True,  # Enable built-in conversation memory
+        )
+
+        # Start the session now, so the agent reuses it and its calls go through the tool cache
+        tool_cache.install((await client.create_session(SERVER_NAME)).connector)
+
+        async def get_connector():
+            session = client.sessions.get(SERVER_NAME)
+            if session is None:
+                session = await client.create_session(SERVER_NAME)
+            return session.connector
+
+    # Simple city lookups skip the LLM; set WEATHER_ROUTER=0 to disable
+    router = QueryRouter(RouterConfig.from_env())
+
+    # Keep the history under a token budget (WEATHER_MEMORY_TOKENS)
+    memory_policy = MemoryPolicy.from_env()
+
+    # Read input without blocking the event loop, and look cities up while
+    # they are being typed; fast-path answers reuse these calls, and they warm
+    # the server's cache for the agent's own tool calls
+    async def tool_text(tool: str, city: str) -> str:
+        return await call_tool_direct(await get_connector(), tool, {"city": city, "include_text": True})
+
+    prefetcher = Prefetcher({
+        "weather": lambda city: tool_text("get_weather", city),
+        "forecast": lambda city: tool_text("get_forecast", city),
+        "snapshot": lambda city: tool_text("get_snapshot", city),
+    })
+    reader = LineReader(on_change=prefetcher.on_change)
 
     print("\n===== Interactive MCP India Weather Chat =====")
     print("Type the name of an Indian city to get current weather.")
     print("Type 'exit' or 'quit' to end the conversation")
     print("Type 'clear' to clear conversation history")
+    print("Type 'stats' to show routing, tool cache and latency metrics")
     print("==================================\n")
 
     try:
         # Main chat loop
         while True:
             # Get user input
-            user_input = input("\nYou: ")
+            user_input = await reader.readline("\nYou: ")
 
             # Check for exit command
             if user_input.lower() in ["exit", "quit"]:
@@ -50,25 +183,47 @@ async def run_memory_chat():
             # Check for clear history command
             if user_input.lower() == "clear":
                 agent.clear_conversation_history()
+                tool_cache.clear()
+                if connector is not None:
+                    # Start the next conversation on a fresh pooled server
+                    await connector.disconnect()
                 print("Conversation history cleared.")
                 continue
 
+            if user_input.lower() == "stats":
+                print(metrics.format())
+                print(tool_cache.format())
+                continue
+
             # Get response from agent
             print("\nAssistant: ", end="", flush=True)
 
             try:
-                # Run the agent with the user input (memory handling is automatic)
-                response = await agent.run(user_input)
-                print(response)
+                # Stream the agent's answer (memory handling is automatic)
+                start = time.perf_counter()
+                first_token = True
+                async for chunk in stream_answer(agent, get_connector, router, user_input, prefetcher):
+                    # Time to the first model token or fast-path answer, not to tool progress
+                    if first_token and not isinstance(chunk, Progress):
+                        metrics.observe("agent.ttft_seconds", time.perf_counter() - start)
+                        first_token = False
+                    print(chunk, end="", flush=True)
+                print()
+                metrics.observe("agent.turn_seconds", time.perf_counter() - start)
+                memory_policy.apply(agent)
 
             except Exception as e:
                 print(f"\nError: {e}")
 
     finally:
+        print(tool_cache.format())
         # Clean up
         if client and client.sessions:
             await client.close_all_sessions()
+        if pool is not None:
+            await connector.disconnect()
+            await pool.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(run_memory_chat())
\ No newline at end of file
+    asyncio.run(run_memory_chat())
@@ -1,8 +1,30 @@
 
+import asyncio
 import os
-import httpx
+import sys
+from pathlib import Path
+
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+# Allow `mcp run server/weather.py` to import the shared weather_core package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weather_core.cities import INDIAN_CITIES
+from weather_core.models import Forecast, Observation
+from weather_core.providers import providers_from_env
+from weather_core.schema import (
+    CitySnapshot,
+    ForecastReport,
+    WeatherReport,
+    city_snapshot,
+    forecast_report,
+    render_forecast_text,
+    render_snapshot_text,
+    render_weather_text,
+    weather_report,
+)
 
 # Initialize FastMCP server
 mcp = FastMCP("weather")
@@ -11,52 +33,69 @@ mcp = FastMCP("weather")
 load_dotenv()
 API_KEY = os.getenv("OPENWEATHER_API_KEY")
 
-# List of popular Indian cities
-INDIAN_CITIES = [
-    "Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Jaipur", "Lucknow",
-    "Chandigarh", "Bhopal", "Indore", "Patna", "Nagpur", "Kanpur", "Thiruvananthapuram", "Coimbatore", "Vadodara", "Surat"
-]
+# Weather backends (OWM, Open-Meteo, ...) tried fastest first, see weather_core.providers
+providers = providers_from_env(API_KEY)
+
+async def fetch_weather(city: str) -> Observation | None:
+    return await providers.current(city)
 
-async def fetch_weather(city: str) -> dict:
-    url = f"https://api.openweathermap.org/data/2.5/weather?q={city},IN&appid={API_KEY}&units=metric"
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, timeout=20.0)
-            response.raise_for_status()
-            return response.json()
-        except Exception:
-            return None
+async def fetch_forecast(city: str) -> Forecast | None:
+    return await providers.forecast(city)
 
 @mcp.tool()
-async def get_weather(city: str) -> str:
+async def get_weather(city: str, include_text: bool = False) -> WeatherReport:
     """Get current weather for an Indian city.
     Args:
         city: Name of the city (e.g. Delhi)
+        include_text: Also return a human-readable summary in `text`
     """
     if city not in INDIAN_CITIES:
-        return f"City '{city}' is not supported. Choose from: {', '.join(INDIAN_CITIES)}"
+        raise ToolError(f"City '{city}' is not supported. Choose from: {', '.join(INDIAN_CITIES)}")
     data = await fetch_weather(city)
-    if not data or "main" not in data:
-        return "Unable to fetch weather data."
-    weather = data['weather'][0]['description'].title()
-    temp = data['main']['temp']
-    feels_like = data['main']['feels_like']
-    humidity = data['main']['humidity']
-    wind = data['wind']['speed']
-    return (
-        f"Weather in {city}:\n"
-        f"Temperature: {temp} °C\n"
-        f"Feels Like: {feels_like} °C\n"
-        f"Condition: {weather}\n"
-        f"Humidity: {humidity}%\n"
-        f"Wind Speed: {wind} m/s"
-    )
+    if data is None:
+        raise ToolError("Unable to fetch weather data.")
+    report = weather_report(city, data)
+    if include_text:
+        report["text"] = render_weather_text(report)
+    return report
 
-    if not data["features"]:
-        return "No active alerts for this state."
+@mcp.tool()
+async def get_forecast(city: str, hours: int = 24, include_text: bool = False) -> ForecastReport:
+    """Get the 3-hourly weather forecast for an Indian city.
+    Args:
+        city: Name of the city (e.g. Delhi)
+        hours: How far ahead to forecast, up to 120 hours
+        include_text: Also return a human-readable summary in `text`
+    """
+    if city not in INDIAN_CITIES:
+        raise ToolError(f"City '{city}' is not supported. Choose from: {', '.join(INDIAN_CITIES)}")
+    data = await fetch_forecast(city)
+    if data is None:
+        raise ToolError("Unable to fetch forecast data.")
+    report = forecast_report(city, data, hours=min(hours, 120))
+    if include_text:
+        report["text"] = render_forecast_text(report)
+    return report
 
-    alerts = [format_alert(feature) for feature in data["features"]]
-    return "\n---\n".join(alerts)
+@mcp.tool()
+async def get_snapshot(city: str, hours: int = 12, include_text: bool = False) -> CitySnapshot:
+    """Get current weather and a forecast summary for an Indian city in one call.
+    Use this for questions about both now and later (e.g. "what's it like in
+    Pune now and later today?") instead of calling get_weather and get_forecast.
+    Args:
+        city: Name of the city (e.g. Delhi)
+        hours: How far ahead to summarize the forecast, up to 120 hours
+        include_text: Also return a human-readable summary in `text`
+    """
+    if city not in INDIAN_CITIES:
+        raise ToolError(f"City '{city}' is not supported. Choose from: {', '.join(INDIAN_CITIES)}")
+    current, forecast = await asyncio.gather(fetch_weather(city), fetch_forecast(city))
+    if current is None and forecast is None:
+        raise ToolError("Unable to fetch weather data.")
+    snapshot = city_snapshot(city, current, forecast, hours=min(hours, 120))
+    if include_text:
+        snapshot["text"] = render_snapshot_text(snapshot)
+    return snapshot
 
 
 @mcp.resource("echo://{message}")
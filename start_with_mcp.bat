@@ -45,20 +45,22 @@ echo This will start:
 echo 1. MCP Server (for AI assistant functionality)
 echo 2. Streamlit App (main weather dashboard)
 echo.
-echo Press Ctrl+C to stop both services
+echo Close the two service windows to stop them
 echo.
 
-REM Start MCP server in background
+REM Start both services at once, each in its own window
 echo Starting MCP Server...
 start "MCP Server" cmd /k "python mcpserver/server.py"
-
-REM Wait a moment for MCP server to start
-timeout /t 3 /nobreak >nul
-
-REM Start Streamlit app
 echo Starting Streamlit App...
-streamlit run india_streamlit_app.py
+start "Streamlit App" cmd /k "streamlit run india_streamlit_app.py"
+
+REM Wait for both health checks together (up to 60 seconds)
+python -m weather_core.readiness http://localhost:8000/health http://localhost:8501/_stcore/health --timeout 60
+if errorlevel 1 (
+    echo WARNING: not every service is answering yet, check the MCP Server and Streamlit App windows
+) else (
+    echo Weather app running at http://localhost:8501
+)
 
 echo.
-echo Services stopped.
 pause
@@ -0,0 +1,54 @@
+"""
+Smoke test: call every tool of both weather servers with only its required
+arguments, through a real MCP client session (so results are validated
+against each tool's output schema), using the offline ``local`` provider.
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+ROOT = Path(__file__).resolve().parent.parent
+SERVERS = {"mcpserver": ROOT / "mcpserver" / "server.py", "server": ROOT / "server" / "weather.py"}
+
+
+def load_server(name: str):
+    os.environ["WEATHER_PROVIDERS"] = "local"
+    os.environ.pop("WEATHER_STORE", None)
+    os.environ.pop("WEATHER_CASSETTE", None)
+    spec = importlib.util.spec_from_file_location(f"smoke_{name}", SERVERS[name])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def sample_arguments(schema: dict) -> dict:
+    arguments = {}
+    for name in schema.get("required", []):
+        if name != "city":
+            raise AssertionError(f"no sample value for required argument {name!r}")
+        arguments[name] = "Delhi"
+    return arguments
+
+
+async def call_every_tool(server) -> dict:
+    results = {}
+    async with create_connected_server_and_client_session(server.mcp) as session:
+        for tool in (await session.list_tools()).tools:
+            results[tool.name] = await session.call_tool(tool.name, sample_arguments(tool.inputSchema))
+    return results
+
+
+@pytest.mark.parametrize("name", SERVERS)
+def test_every_tool_with_required_arguments_only(name):
+    results = asyncio.run(call_every_tool(load_server(name)))
+    assert {"get_weather", "get_forecast", "get_snapshot"} <= set(results)
+    for tool, result in results.items():
+        assert not result.isError, f"{tool}: {result.content[0].text if result.content else result}"
+        assert result.structuredContent is not None, tool
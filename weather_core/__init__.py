@@ -0,0 +1 @@
+"""Shared building blocks for the India weather servers, clients and app."""
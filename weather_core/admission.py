@@ -0,0 +1,89 @@
+"""
+Admission control for the MCP server's tool calls.
+
+When upstream slows down, every accepted call holds a coroutine and a socket
+until its fetch finishes or times out, so an unbounded server fills with
+waiting calls and all of them end up slow. ``AdmissionController`` caps the
+calls running at once, lets a bounded number wait for a slot, and sheds the
+rest immediately:
+
+* a call arriving while the queue is full is rejected at once;
+* a queued call that does not get a slot within ``queue_timeout_s`` (or
+  before its deadline) is rejected;
+* an admitted call has until its deadline to finish: ``deadline_s`` after
+  arrival, or sooner if the caller asks for less.
+
+Callers catch ``Overloaded`` and answer from the cache if they can.
+Queue depth, in-flight calls, wait time and shed counts are reported as
+``admission.*`` metrics.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+from weather_core.metrics import metrics
+
+
+class Overloaded(Exception):
+    """The call was shed instead of being run."""
+
+
+class AdmissionController:
+    def __init__(self, max_inflight: int = 32, max_queue: int = 64, queue_timeout_s: float = 2.0,
+                 deadline_s: float = 15.0):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout_s = queue_timeout_s
+        self.deadline_s = deadline_s
+        self.inflight = 0
+        self.queued = 0
+        self._slots = asyncio.Semaphore(max_inflight)
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            max_inflight=int(os.getenv("WEATHER_MCP_MAX_INFLIGHT", "32")),
+            max_queue=int(os.getenv("WEATHER_MCP_MAX_QUEUE", "64")),
+            queue_timeout_s=float(os.getenv("WEATHER_MCP_QUEUE_TIMEOUT_S", "2")),
+            deadline_s=float(os.getenv("WEATHER_MCP_DEADLINE_S", "15")),
+        )
+
+    def _shed(self, reason: str) -> Overloaded:
+        metrics.incr("admission.shed")
+        metrics.incr(f"admission.shed.{reason}")
+        return Overloaded(reason.replace("_", " "))
+
+    @asynccontextmanager
+    async def admit(self, timeout_s: float | None = None):
+        """Hold a slot for one call; yields the call's deadline in ``time.monotonic()`` seconds.
+
+        ``timeout_s`` shortens the call's budget; it cannot extend it past ``deadline_s``.
+        """
+        arrived = time.monotonic()
+        deadline = arrived + min(timeout_s or self.deadline_s, self.deadline_s)
+        if self._slots.locked():
+            if self.queued >= self.max_queue:
+                raise self._shed("queue_full")
+            self.queued += 1
+            metrics.gauge("admission.queued", self.queued)
+            try:
+                async with asyncio.timeout_at(min(deadline, arrived + self.queue_timeout_s)):
+                    await self._slots.acquire()
+            except TimeoutError:
+                raise self._shed("queue_timeout") from None
+            finally:
+                self.queued -= 1
+                metrics.gauge("admission.queued", self.queued)
+        else:
+            await self._slots.acquire()
+        metrics.observe("admission.wait_seconds", time.monotonic() - arrived)
+        self.inflight += 1
+        metrics.gauge("admission.inflight", self.inflight)
+        try:
+            yield deadline
+        finally:
+            self.inflight -= 1
+            metrics.gauge("admission.inflight", self.inflight)
+            self._slots.release()
@@ -0,0 +1,46 @@
+"""
+mcp-use connector backed by a StdioServerPool lease.
+
+Pass ``PooledConnector(pool)`` to ``MCPAgent(connectors=[...])``: connecting
+leases a warm server instead of spawning one, and disconnecting returns it.
+"""
+
+from mcp_use.connectors.base import BaseConnector
+
+from weather_core.pool import PooledServer, StdioServerPool
+
+
+class PooledConnector(BaseConnector):
+    """Connector whose session comes from a warm server pool."""
+
+    def __init__(self, pool: StdioServerPool):
+        super().__init__()
+        self.pool = pool
+        self.lease: PooledServer | None = None
+
+    async def connect(self) -> None:
+        if self._connected:
+            return
+        self.lease = await self.pool.lease()
+        self.client = self.lease.session
+        # The pooled session has already done the MCP handshake; only fetch tools
+        self._tools = (await self.client.list_tools()).tools
+        self._connected = True
+
+    async def initialize(self):
+        if not self._connected:
+            await self.connect()
+        return self.lease.init_result
+
+    async def call_tool(self, name: str, arguments: dict):
+        if not self._connected:
+            await self.connect()
+        return await self.lease.call_tool(name, arguments)
+
+    async def disconnect(self) -> None:
+        if self.lease is not None:
+            await self.pool.release(self.lease)
+        self.lease = None
+        self.client = None
+        self._tools = None
+        self._connected = False
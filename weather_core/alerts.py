@@ -0,0 +1,202 @@
+"""
+Vectorized threshold alerts over every city's forecast.
+
+Forecasts are kept in a cities x 3-hour-slots grid of NumPy arrays. Slots
+are addressed by absolute time (``dt // 3h``, modulo the grid width), so a
+refreshed forecast that has only moved forward by one slot changes one
+column, not all of them.
+
+``update_many`` writes new forecasts into the grid and finds the cells whose
+values actually changed. It then evaluates every rule on those cells (plus the
+slot before each, for rules that compare neighbouring slots) in one pass. The
+work done grows with the number of changed cells, not with rules x cities x
+slots.
+
+Alerts are identified by ``(rule, city, slot time)``. A cell that keeps
+triggering is reported once, and its alert is cleared when a later forecast
+drops below the threshold or the slot is in the past.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from weather_core.metrics import metrics
+from weather_core.models import Forecast
+from weather_core.schema import WeatherAlert
+
+SLOT_S = 3 * 3600  # OpenWeatherMap forecast resolution
+FIELDS = ("temp_c", "humidity_pct", "wind_mps", "rain_mm")
+METRICS = ("heat_index_c", "wind_mps", "rain_mm", "temp_drop_c")
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    """Raise ``severity`` when ``metric`` reaches ``threshold``."""
+    name: str
+    metric: str  # one of METRICS
+    threshold: float
+    severity: str
+    label: str
+    unit: str
+
+    def message(self, value: float) -> str:
+        return f"{self.label} {value:g}{self.unit} (threshold {self.threshold:g}{self.unit})"
+
+
+@dataclass
+class AlertConfig:
+    """Rule thresholds; defaults can be overridden from the environment."""
+    heat_index_c: float = 41.0  # IMD/NOAA "danger" band
+    wind_mps: float = 17.0  # gale force, ~61 km/h
+    rain_mm_3h: float = 15.0  # heavy rain over one 3-hour slot
+    temp_drop_c: float = 6.0  # fall between consecutive slots
+
+    @classmethod
+    def from_env(cls) -> "AlertConfig":
+        return cls(
+            heat_index_c=float(os.getenv("WEATHER_ALERT_HEAT_INDEX_C", cls.heat_index_c)),
+            wind_mps=float(os.getenv("WEATHER_ALERT_WIND_MPS", cls.wind_mps)),
+            rain_mm_3h=float(os.getenv("WEATHER_ALERT_RAIN_MM", cls.rain_mm_3h)),
+            temp_drop_c=float(os.getenv("WEATHER_ALERT_TEMP_DROP_C", cls.temp_drop_c)),
+        )
+
+    def rules(self) -> tuple[AlertRule, ...]:
+        return (
+            AlertRule("heat", "heat_index_c", self.heat_index_c, "warning", "Heat index", "°C"),
+            AlertRule("wind", "wind_mps", self.wind_mps, "warning", "Wind", " m/s"),
+            AlertRule("rain", "rain_mm", self.rain_mm_3h, "watch", "Heavy rain", " mm/3h"),
+            AlertRule("temp_drop", "temp_drop_c", self.temp_drop_c, "advisory", "Temperature drop", "°C in 3h"),
+        )
+
+
+def heat_index_c(temp_c: np.ndarray, humidity_pct: np.ndarray) -> np.ndarray:
+    """NOAA heat index (Rothfusz regression, simple formula below 80°F)."""
+    t = temp_c * 9 / 5 + 32
+    rh = humidity_pct
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379 + 2.04901523 * t + 10.14333127 * rh - 0.22475541 * t * rh
+        - 6.83783e-3 * t * t - 5.481717e-2 * rh * rh + 1.22874e-3 * t * t * rh
+        + 8.5282e-4 * t * rh * rh - 1.99e-6 * t * t * rh * rh
+    )
+    hi = np.where((simple + t) / 2 >= 80, full, simple)
+    return (hi - 32) * 5 / 9
+
+
+class AlertEngine:
+    """Incrementally maintained alert set for a fixed list of cities."""
+
+    def __init__(self, cities: list[str], config: AlertConfig | None = None, slots: int = 48):
+        self.cities = list(cities)
+        self._rows = {city: i for i, city in enumerate(self.cities)}
+        self.slots = slots  # > 40 so a 5-day forecast never wraps onto itself
+        shape = (len(self.cities), slots)
+        self.values = np.full((len(FIELDS), *shape), np.nan)
+        self.slot_dt = np.zeros(shape, dtype=np.int64)
+        self.rules = (config or AlertConfig()).rules()
+        self._rule_metric = np.array([METRICS.index(rule.metric) for rule in self.rules])
+        self._thresholds = np.array([rule.threshold for rule in self.rules])
+        self.active: dict[tuple[str, str, int], WeatherAlert] = {}
+        self.version = 0  # bumped whenever an alert is raised, cleared or changes value
+
+    def update(self, city: str, data: Forecast, now: float | None = None) -> list[WeatherAlert]:
+        """Apply one city's forecast; return newly raised alerts."""
+        return self.update_many({city: data}, now)
+
+    def update_many(self, forecasts: dict[str, Forecast], now: float | None = None) -> list[WeatherAlert]:
+        """Apply several forecasts at once; return newly raised alerts."""
+        now = time.time() if now is None else now
+        rows, dts, columns = [], [], []
+        for city, data in forecasts.items():
+            points = data.points
+            if city not in self._rows or not points:
+                continue
+            rows.append(np.full(len(points), self._rows[city]))
+            dts.append(np.fromiter((point.dt for point in points), dtype=np.int64, count=len(points)))
+            columns.append(np.array([
+                [point.temp_c for point in points],
+                [point.humidity_pct for point in points],
+                [point.wind_mps for point in points],
+                [point.rain_mm for point in points],
+            ], dtype=float))
+        raised, cleared, revised = [], 0, 0
+        if rows:
+            raised, cleared, revised = self._apply(np.concatenate(rows), np.concatenate(dts), np.hstack(columns))
+        cleared += self._expire(now)
+        if raised or cleared or revised:
+            self.version += 1
+        metrics.incr("alerts.raised", len(raised))
+        metrics.incr("alerts.cleared", cleared)
+        metrics.incr("alerts.revised", revised)
+        metrics.gauge("alerts.active", len(self.active))
+        return raised
+
+    def _apply(self, rows: np.ndarray, dts: np.ndarray, new: np.ndarray) -> tuple[list[WeatherAlert], int, int]:
+        """Write new values into the grid; return the alerts raised, cleared and revised."""
+        cols = (dts // SLOT_S) % self.slots
+        old = self.values[:, rows, cols]
+        same = (old == new) | (np.isnan(old) & np.isnan(new))
+        changed = (self.slot_dt[rows, cols] != dts) | ~same.all(axis=0)
+        self.values[:, rows, cols] = new
+        self.slot_dt[rows, cols] = dts
+        if not changed.any():
+            return [], 0, 0
+
+        # A changed slot also changes the temperature drop measured from the slot before it
+        rows, cols, dts = rows[changed], cols[changed], dts[changed]
+        prev_cols = (cols - 1) % self.slots
+        has_prev = self.slot_dt[rows, prev_cols] == dts - SLOT_S
+        cells = np.unique(np.concatenate([rows * self.slots + cols, (rows * self.slots + prev_cols)[has_prev]]))
+        rows, cols = np.divmod(cells, self.slots)
+        dts = self.slot_dt[rows, cols]
+        metrics.incr("alerts.cells_evaluated", len(cells))
+
+        temp, humidity, wind, rain = self.values[:, rows, cols]
+        next_cols = (cols + 1) % self.slots
+        has_next = self.slot_dt[rows, next_cols] == dts + SLOT_S
+        drop = np.where(has_next, temp - self.values[0, rows, next_cols], np.nan)
+        by_metric = np.stack([heat_index_c(temp, humidity), wind, rain, drop])
+        values = by_metric[self._rule_metric]  # rules x cells
+        with np.errstate(invalid="ignore"):
+            hits = values >= self._thresholds[:, None]
+
+        raised, cleared, revised = [], 0, 0
+        for r, c in zip(*np.nonzero(~hits)):
+            if self.active.pop((self.rules[r].name, self.cities[rows[c]], int(dts[c])), None):
+                cleared += 1
+        for r, c in zip(*np.nonzero(hits)):
+            rule, city, at = self.rules[r], self.cities[rows[c]], int(dts[c])
+            value = round(float(values[r, c]), 1)
+            key = (rule.name, city, at)
+            if key in self.active:
+                if self.active[key]["value"] != value:
+                    self.active[key].update(value=value, message=rule.message(value))
+                    revised += 1
+                continue
+            self.active[key] = alert = WeatherAlert(
+                rule=rule.name,
+                city=city,
+                severity=rule.severity,
+                at=at,
+                value=value,
+                threshold=rule.threshold,
+                message=rule.message(value),
+            )
+            raised.append(alert)
+        return raised, cleared, revised
+
+    def _expire(self, now: float) -> int:
+        expired = [key for key in self.active if key[2] + SLOT_S <= now]
+        for key in expired:
+            del self.active[key]
+        return len(expired)
+
+    def alerts(self, city: str | None = None) -> list[WeatherAlert]:
+        """Active alerts, optionally for one city, soonest first."""
+        return sorted(
+            (alert for alert in self.active.values() if city is None or alert["city"] == city),
+            key=lambda alert: (alert["at"], alert["city"], alert["rule"]),
+        )
@@ -0,0 +1,215 @@
+"""
+Record and replay upstream weather traffic.
+
+In ``record`` mode every request the provider chain sends upstream is written
+to a cassette file (JSON lines, gzipped when the name ends in ``.gz``): the
+method and URL with the API key removed, the status, the content type and
+validators (``ETag``, ``Last-Modified``), the body and the observed latency. In ``replay`` mode the same requests are
+answered from the cassette without touching the network, after sleeping for
+the recorded latency multiplied by a speed factor (0 answers at once). A
+production capture can then be replayed as a repeatable offline benchmark.
+
+Requests seen several times are answered with their recorded responses in
+order, wrapping around when the recording runs out; a recorded 304 is only
+used to answer a request that carries validators. A request that was never
+recorded fails like a connection error, so the chain moves to the next
+provider just as it would when offline.
+
+Each recording process writes its own part file next to the cassette, with
+its pid before the extension (``monday.4242.jsonl.gz``), so server workers and
+supervisor replicas never interleave writes into one (gzipped) file. Replay
+and the summary read the cassette and all of its parts.
+
+Enabled for the MCP server, the MCP client and the Streamlit app alike with::
+
+    WEATHER_CASSETTE=captures/monday.jsonl.gz
+    WEATHER_CASSETTE_MODE=record          # or replay
+    WEATHER_CASSETTE_SPEED=1.0            # replay latency scale
+
+``python -m weather_core.cassette FILE`` summarizes a recording.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+
+SECRET_PARAMS = {"appid", "apikey", "api_key", "key"}
+# Response headers kept besides the content type, so conditional requests work when recording and replaying
+KEPT_HEADERS = ("etag", "last-modified")
+
+
+def request_key(method: str, url: httpx.URL) -> str:
+    """``METHOD url`` with query parameters sorted and credentials removed."""
+    params = sorted((k, v) for k, v in url.params.multi_items() if k.lower() not in SECRET_PARAMS)
+    query = f"?{urlencode(params)}" if params else ""
+    return f"{method} {url.scheme}://{url.host}{url.path}{query}"
+
+
+def _extension(path: Path) -> str:
+    return "".join(path.suffixes[-2:]) if path.suffix == ".gz" else path.suffix
+
+
+def part_path(path: Path, pid: int) -> Path:
+    """The part of cassette ``path`` recorded by process ``pid``."""
+    ext = _extension(path)
+    return path.with_name(f"{path.name[:len(path.name) - len(ext)]}.{pid}{ext}")
+
+
+def parts(path: Path) -> list[Path]:
+    """The cassette file itself, if any, followed by its per-process parts."""
+    ext = _extension(path)
+    part = re.compile(re.escape(path.name[:len(path.name) - len(ext)]) + r"\.\d+" + re.escape(ext))
+    found = sorted(p for p in path.parent.glob("*") if part.fullmatch(p.name))
+    return ([path] if path.exists() or not found else []) + found
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """One recording, shared by every HTTP client in the process."""
+
+    def __init__(self, path: str | Path, mode: str = "replay", speed: float = 1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode {mode!r} (choose record or replay)")
+        self.path = Path(path)
+        self.mode = mode
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries: dict[str, list[dict]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        if mode == "replay":
+            for entry in load(self.path):
+                self._entries[entry["key"]].append(entry)
+
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """A transport for one client; clients may live on different event loops."""
+        return CassetteTransport(self)
+
+    def record(self, entry: dict) -> None:
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = _open(part_path(self.path, os.getpid()), "a")
+            self._file.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+            self._file.flush()
+
+    def next_entry(self, key: str, conditional: bool = False) -> dict | None:
+        """The next recorded response to ``key``; a 304 only answers a ``conditional`` request."""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            for _ in range(len(entries)):
+                entry = entries[self._cursor[key] % len(entries)]
+                self._cursor[key] += 1
+                if conditional or entry["status"] != 304:
+                    return entry
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._inner = httpx.AsyncHTTPTransport() if cassette.mode == "record" else None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, request.url)
+        if self._inner is None:
+            return await self._replay(key, request)
+
+        start = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        body = await response.aread()
+        latency = time.perf_counter() - start
+        content_type = response.headers.get("content-type", "application/json")
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        self.cassette.record({
+            "key": key,
+            "status": response.status_code,
+            "content_type": content_type,
+            "headers": headers,
+            "latency_s": round(latency, 4),
+            "at": int(time.time()),
+            "body": body.decode("utf-8", errors="replace"),
+        })
+        return httpx.Response(
+            response.status_code, headers={"content-type": content_type, **headers}, content=body, request=request
+        )
+
+    async def _replay(self, key: str, request: httpx.Request) -> httpx.Response:
+        conditional = "if-none-match" in request.headers or "if-modified-since" in request.headers
+        entry = self.cassette.next_entry(key, conditional)
+        if entry is None:
+            raise httpx.ConnectError(f"Not in cassette {self.cassette.path}: {key}", request=request)
+        if self.cassette.speed > 0:
+            await asyncio.sleep(entry["latency_s"] * self.cassette.speed)
+        headers = {"content-type": entry["content_type"], **entry.get("headers", {})}
+        return httpx.Response(entry["status"], headers=headers, content=entry["body"].encode(), request=request)
+
+    async def aclose(self) -> None:
+        if self._inner is not None:
+            await self._inner.aclose()
+
+
+def load(path: str | Path) -> list[dict]:
+    """Every entry of a cassette and its parts, in recording order within each file."""
+    entries = []
+    for part in parts(Path(path)):
+        with _open(part, "r") as f:
+            entries += [json.loads(line) for line in f if line.strip()]
+    return entries
+
+
+def cassette_from_env() -> Cassette | None:
+    path = os.getenv("WEATHER_CASSETTE")
+    if not path:
+        return None
+    return Cassette(
+        path,
+        mode=os.getenv("WEATHER_CASSETTE_MODE", "replay").lower(),
+        speed=float(os.getenv("WEATHER_CASSETTE_SPEED", "1.0")),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a recorded upstream cassette")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    entries = load(args.path)
+    by_host = defaultdict(list)
+    for entry in entries:
+        by_host[entry["key"].split("/")[2]].append(entry)
+    print(f"{len(entries)} responses, {len({e['key'] for e in entries})} distinct requests")
+    for host, host_entries in sorted(by_host.items()):
+        latencies = sorted(e["latency_s"] for e in host_entries)
+        errors = sum(e["status"] >= 400 for e in host_entries)
+        print(
+            f"{host:<28} {len(host_entries):5d} responses  {errors:4d} errors  "
+            f"p50 {latencies[len(latencies) // 2] * 1000:6.0f} ms  max {latencies[-1] * 1000:6.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Supported Indian cities, their aliases, the states standing in for them and
+their coordinates.
+
+Finding cities in free text is ``weather_core.intents.extract``.
+"""
+
+# List of popular Indian cities
+INDIAN_CITIES = [
+    "Delhi", "Mumbai", "Bangalore", "Chennai", "Kolkata", "Hyderabad", "Pune", "Ahmedabad", "Jaipur", "Lucknow",
+    "Chandigarh", "Bhopal", "Indore", "Patna", "Nagpur", "Kanpur", "Thiruvananthapuram", "Coimbatore", "Vadodara", "Surat"
+]
+
+# Alternate names and common misspellings, mapped to the canonical city
+CITY_ALIASES = {
+    "new delhi": "Delhi",
+    "banglore": "Bangalore",
+    "bengaluru": "Bangalore",
+    "bombay": "Mumbai",
+    "calcutta": "Kolkata",
+    "madras": "Chennai",
+    "trivandrum": "Thiruvananthapuram",
+    "baroda": "Vadodara",
+}
+
+# States the chat accepts in place of their capital's weather
+REGION_CITIES = {
+    "karnataka": "Bangalore",
+    "maharashtra": "Mumbai",
+    "tamil nadu": "Chennai",
+    "west bengal": "Kolkata",
+}
+
+# (latitude, longitude) for providers that look weather up by position
+CITY_COORDINATES = {
+    "Delhi": (28.6139, 77.2090),
+    "Mumbai": (19.0760, 72.8777),
+    "Bangalore": (12.9716, 77.5946),
+    "Chennai": (13.0827, 80.2707),
+    "Kolkata": (22.5726, 88.3639),
+    "Hyderabad": (17.3850, 78.4867),
+    "Pune": (18.5204, 73.8567),
+    "Ahmedabad": (23.0225, 72.5714),
+    "Jaipur": (26.9124, 75.7873),
+    "Lucknow": (26.8467, 80.9462),
+    "Chandigarh": (30.7333, 76.7794),
+    "Bhopal": (23.2599, 77.4126),
+    "Indore": (22.7196, 75.8577),
+    "Patna": (25.5941, 85.1376),
+    "Nagpur": (21.1458, 79.0882),
+    "Kanpur": (26.4499, 80.3319),
+    "Thiruvananthapuram": (8.5241, 76.9366),
+    "Coimbatore": (11.0168, 76.9558),
+    "Vadodara": (22.3072, 73.1812),
+    "Surat": (21.1702, 72.8311),
+}
+
+_CANONICAL = {city.lower(): city for city in INDIAN_CITIES}
+_CANONICAL.update(CITY_ALIASES)
+
+
+def canonical_city(name: str) -> str | None:
+    """Return the canonical spelling of a city name or alias, if supported."""
+    return _CANONICAL.get(name.strip().lower())
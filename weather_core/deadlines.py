@@ -0,0 +1,49 @@
+"""
+Call deadlines carried from an MCP tool call down to the upstream fetch.
+
+A deadline is an absolute ``time.monotonic()`` value stored in a context
+variable, so it follows the call into ``asyncio`` tasks it starts without being
+passed through every function. Nested scopes can only shorten it. The provider
+chain sizes each upstream attempt to the time left and stops retrying once
+none is left.
+
+Clients set a tool call's budget with ``timeout_ms`` in the request ``_meta``;
+the server caps it at its own default.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline: ContextVar[float | None] = ContextVar("weather_deadline", default=None)
+
+
+def current_deadline() -> float | None:
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(deadline: float):
+    """Run the block under ``deadline`` (monotonic seconds), or the outer one if sooner."""
+    outer = _deadline.get()
+    token = _deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield _deadline.get()
+    finally:
+        _deadline.reset(token)
+
+
+def timeout_from_meta(meta) -> float | None:
+    """The ``timeout_ms`` a client put in a request's ``_meta``, in seconds."""
+    extra = getattr(meta, "model_extra", None) or {}
+    try:
+        timeout_ms = float(extra["timeout_ms"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return timeout_ms / 1000 if timeout_ms > 0 else None
@@ -0,0 +1,59 @@
+"""
+Bounded concurrent fan-out for questions that mention several cities.
+
+Fetching five cities one after another costs five upstream round-trips;
+``gather_limited`` runs them together so the answer takes about as long as
+the slowest fetch, while a semaphore keeps a long list of cities from
+opening more than ``WEATHER_FETCH_CONCURRENCY`` connections at once.
+``as_completed_limited`` does the same but hands back each result as soon as
+it arrives, for answers that are streamed city by city.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import TypeVar
+
+from weather_core.metrics import metrics
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+MAX_CONCURRENCY = int(os.getenv("WEATHER_FETCH_CONCURRENCY", "5"))
+
+
+async def gather_limited(
+    fetch: Callable[[T], Awaitable[R]], items: Iterable[T], limit: int | None = None
+) -> list[R]:
+    """Run ``fetch(item)`` for every item concurrently, at most ``limit`` at a time.
+
+    Results come back in the order of ``items``.
+    """
+    semaphore = asyncio.Semaphore(limit or MAX_CONCURRENCY)
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await fetch(item)
+
+    with metrics.timer("chat.fanout_seconds"):
+        return await asyncio.gather(*(run(item) for item in items))
+
+
+async def as_completed_limited(
+    fetch: Callable[[T], Awaitable[R]], items: Iterable[T], limit: int | None = None
+) -> AsyncIterator[tuple[T, R]]:
+    """Like ``gather_limited``, but yield ``(item, result)`` pairs in the order the fetches finish."""
+    semaphore = asyncio.Semaphore(limit or MAX_CONCURRENCY)
+
+    async def run(item: T) -> tuple[T, R]:
+        async with semaphore:
+            return item, await fetch(item)
+
+    tasks = [asyncio.ensure_future(run(item)) for item in items]
+    try:
+        with metrics.timer("chat.fanout_seconds"):
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
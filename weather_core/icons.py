@@ -0,0 +1,119 @@
+"""
+Weather condition icons, served by the app instead of OpenWeatherMap's CDN.
+
+Rendering never fetches anything. ``icon_image(code)`` returns:
+
+* the official OWM PNG, if it has been downloaded to the icon directory
+  (``WEATHER_ICON_DIR``, default ``~/.cache/weather-icons``), or
+* a bundled SVG drawn from the same condition groups, so offline and
+  air-gapped deployments show icons too.
+
+``st.image`` serves either through Streamlit's own media endpoint. Download
+the PNGs once, where there is network access, and copy the directory to
+hosts that have none:
+
+    python -m weather_core.icons [--dir DIR]
+"""
+
+import argparse
+import os
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+
+# Every icon OWM uses: condition group + d(ay)/n(ight)
+ICON_GROUPS = ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+ICON_CODES = tuple(group + period for group in ICON_GROUPS for period in "dn")
+ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+
+ICON_DIR = Path(os.getenv("WEATHER_ICON_DIR", Path.home() / ".cache" / "weather-icons"))
+
+_SUN = (
+    '<circle cx="{x}" cy="{y}" r="{r}" fill="#f6b93b"/>'
+    '<g stroke="#f6b93b" stroke-width="4" stroke-linecap="round">'
+    '<path d="M{x} {y0}v-8M{x} {y1}v8M{x0} {y}h-8M{x1} {y}h8"/></g>'
+)
+_MOON = '<path d="M{x1} {y0}a{r} {r} 0 1 0 0 {d}a{rr} {rr} 0 0 1 0-{d}z" fill="#c8d6e5"/>'
+_CLOUD = (
+    '<path d="M28 74h46a14 14 0 0 0 0-28a20 20 0 0 0-38-4a15 15 0 0 0-8 32z" '
+    'fill="{fill}" stroke="#8395a7" stroke-width="2"/>'
+)
+_RAIN = '<g stroke="#2e86de" stroke-width="4" stroke-linecap="round"><path d="M36 80l-4 10M52 80l-4 10M68 80l-4 10"/></g>'
+_BOLT = '<path d="M52 70l-10 16h9l-5 12 14-18h-9l5-10z" fill="#feca57"/>'
+_SNOW = (
+    '<g fill="#54a0ff"><circle cx="36" cy="86" r="3"/><circle cx="52" cy="90" r="3"/>'
+    '<circle cx="68" cy="86" r="3"/></g>'
+)
+_MIST = '<g stroke="#8395a7" stroke-width="5" stroke-linecap="round"><path d="M20 38h60M14 52h72M20 66h60M30 80h40"/></g>'
+
+
+def _sky(x: int, y: int, r: int, night: bool) -> str:
+    if night:
+        return _MOON.format(x1=x + r // 2, y0=y - r, r=r, rr=round(r * 1.3), d=2 * r)
+    return _SUN.format(x=x, y=y, r=r, y0=y - r - 5, y1=y + r + 5, x0=x - r - 5, x1=x + r + 5)
+
+
+@lru_cache(maxsize=None)
+def bundled_svg(code: str) -> str:
+    """A simple SVG for an OWM icon code, e.g. ``"10d"``."""
+    group, night = code[:2], code.endswith("n")
+    light, dark = "#f1f2f6", "#a4b0be"
+    parts = {
+        "01": [_sky(50, 50, 20, night)],
+        "02": [_sky(38, 38, 14, night), _CLOUD.format(fill=light)],
+        "03": [_CLOUD.format(fill=light)],
+        "04": ['<g transform="translate(10 -12) scale(.8)">' + _CLOUD.format(fill=dark) + "</g>", _CLOUD.format(fill=light)],
+        "09": [_CLOUD.format(fill=dark), _RAIN],
+        "10": [_sky(34, 34, 12, night), _CLOUD.format(fill=light), _RAIN],
+        "11": [_CLOUD.format(fill=dark), _BOLT],
+        "13": [_CLOUD.format(fill=light), _SNOW],
+        "50": [_MIST],
+    }.get(group, [_CLOUD.format(fill=light)])
+    return '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">' + "".join(parts) + "</svg>"
+
+
+_pngs: dict[str, bytes] = {}
+
+
+def _cached_png(code: str) -> bytes | None:
+    # Only hits are cached, so icons downloaded while the app runs are picked up
+    if code not in _pngs:
+        try:
+            _pngs[code] = (ICON_DIR / f"{code}.png").read_bytes()
+        except OSError:
+            return None
+    return _pngs[code]
+
+
+def icon_image(code: str) -> bytes | str:
+    """PNG bytes from the local icon directory, else the bundled SVG; never a URL."""
+    return _cached_png(code) or bundled_svg(code)
+
+
+def download_icons(directory: Path = ICON_DIR, timeout: float = 10.0) -> list[str]:
+    """Download every OWM icon not already in ``directory``; returns the codes fetched."""
+    directory.mkdir(parents=True, exist_ok=True)
+    fetched = []
+    for code in ICON_CODES:
+        path = directory / f"{code}.png"
+        if path.exists():
+            continue
+        with urllib.request.urlopen(ICON_URL.format(code=code), timeout=timeout) as response:
+            data = response.read()
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+        fetched.append(code)
+    return fetched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the OpenWeatherMap condition icons for offline use")
+    parser.add_argument("--dir", type=Path, default=ICON_DIR)
+    args = parser.parse_args()
+    fetched = download_icons(args.dir)
+    print(f"{len(fetched)} icons downloaded, {len(ICON_CODES) - len(fetched)} already present in {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Compiled intent and city extractor for the rule-based chat responders.
+
+City names, aliases, state names and intent keywords are compiled into one
+prefix-factored regular expression. A single ``finditer`` pass over the
+question finds every city and every intent, instead of running one substring
+test per city and keyword and stopping at the first city.
+"""
+
+import re
+from dataclasses import dataclass
+
+from weather_core.cities import CITY_ALIASES, INDIAN_CITIES, REGION_CITIES
+
+INTENT_KEYWORDS = {
+    "forecast": ("forecast", "forecasts", "tomorrow", "next", "future", "upcoming", "later", "week", "hourly"),
+    "current": ("now", "right now", "current", "currently"),
+    "temperature": ("temperature", "temp", "hot", "cold"),
+    "humidity": ("humidity", "humid"),
+    "wind": ("wind", "windy"),
+    "compare": ("compare", "comparison", "versus", "vs"),
+    "help": ("help", "what can you do", "what can you help"),
+}
+
+# term -> ("city", canonical name) or ("intent", intent name)
+_TERMS = {city.lower(): ("city", city) for city in INDIAN_CITIES}
+_TERMS.update({alias: ("city", city) for alias, city in {**CITY_ALIASES, **REGION_CITIES}.items()})
+_TERMS.update({word: ("intent", intent) for intent, words in INTENT_KEYWORDS.items() for word in words})
+
+
+
+def _trie_pattern(terms) -> str:
+    """Regex alternation factored by common prefixes ("temp(?:erature)?").
+
+    Python's regex engine tries alternatives one by one; sharing prefixes
+    means each position of the text is tested against a character once
+    rather than once per term.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+# Matched against lowercased text; greedy matching prefers "new delhi" over "delhi"
+TERM_PATTERN = re.compile(r"\b(" + _trie_pattern(_TERMS) + r")\b")
+
+
+@dataclass(frozen=True)
+class Extraction:
+    """Cities (in order of mention, without duplicates) and intents found in a question."""
+    cities: tuple[str, ...]
+    intents: frozenset[str]
+
+
+def extract(text: str) -> Extraction:
+    """Find every supported city and intent keyword in ``text`` in one pass."""
+    cities, intents = [], set()
+    for match in TERM_PATTERN.finditer(text.lower()):
+        kind, value = _TERMS[match.group(1)]
+        if kind == "intent":
+            intents.add(value)
+        elif value not in cities:
+            cities.append(value)
+    return Extraction(tuple(cities), frozenset(intents))
@@ -0,0 +1,164 @@
+"""
+Bounded conversation memory for MCPAgent chats.
+
+MCPAgent keeps every turn in its history, so prompts grow without limit over a
+long session. ``MemoryPolicy.compact`` keeps the history under a token budget:
+
+* recent messages are left untouched;
+* older weather readings for a city are dropped once a newer reading exists;
+* older tool outputs and readings are collapsed to one-line summaries;
+* the oldest turns are evicted if the budget is still exceeded.
+
+Messages are handled by duck typing (``.type`` and ``.content``), so the
+policy works with LangChain messages and with plain stand-ins in benchmarks.
+"""
+
+import copy
+import json
+import os
+import re
+from dataclasses import dataclass
+
+from weather_core.metrics import metrics
+
+# "Weather in Delhi:" as rendered by the tools, or an already-compacted "[Delhi: ...]"
+_READING_CITY = re.compile(r"Weather in ([A-Z][A-Za-z]+)|^\[([A-Z][A-Za-z]+): ")
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+_FIELDS = {
+    "temp": re.compile(r"Temperature: " + _NUMBER),
+    "feels": re.compile(r"Feels Like: " + _NUMBER),
+    "condition": re.compile(r"Condition: ([^\n]+)"),
+    "humidity": re.compile(r"Humidity: " + _NUMBER),
+    "wind": re.compile(r"Wind Speed: " + _NUMBER),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token, as for English prose)."""
+    return len(text) // 4 + 1
+
+
+def message_tokens(message) -> int:
+    # A few tokens of per-message framing on top of the content
+    return estimate_tokens(_text(message)) + 4
+
+
+def _text(message) -> str:
+    content = message.content
+    return content if isinstance(content, str) else json.dumps(content, separators=(",", ":"))
+
+
+def _with_content(message, content: str):
+    if hasattr(message, "model_copy"):
+        return message.model_copy(update={"content": content})
+    clone = copy.copy(message)
+    clone.content = content
+    return clone
+
+
+def reading_city(message) -> str | None:
+    """Return the city a weather reading is about, or None if it is not a reading."""
+    if message.type not in ("ai", "tool"):
+        return None
+    text = _text(message)
+    if text.startswith("{"):
+        try:
+            return json.loads(text).get("city")
+        except (ValueError, AttributeError):
+            return None
+    match = _READING_CITY.search(text)
+    return (match.group(1) or match.group(2)) if match else None
+
+
+def summarize(message, city: str | None, max_chars: int) -> str:
+    """Collapse a tool output or weather reading to a single short line."""
+    text = _text(message)
+    if city and text.startswith("{"):
+        try:
+            data = json.loads(text)
+            data = data.get("current", data)  # get_snapshot nests the reading
+            return f"[{city}: {data['temp_c']}°C, {data['condition']}, {data['humidity_pct']}% RH]"
+        except (ValueError, KeyError, TypeError):
+            pass
+    if city:
+        values = {name: m.group(1) for name, pattern in _FIELDS.items() if (m := pattern.search(text))}
+        if "temp" in values:
+            parts = [f"{values['temp']}°C"]
+            parts += [values[key] for key in ("condition",) if key in values]
+            parts += [f"{values['humidity']}% RH"] if "humidity" in values else []
+            return f"[{city}: {', '.join(parts)}]"
+    flat = " ".join(text.split())
+    return flat if len(flat) <= max_chars else flat[: max_chars - 3] + "..."
+
+
+@dataclass
+class MemoryPolicy:
+    """Token-budgeted compaction rules for agent conversation history."""
+    token_budget: int = 2000
+    keep_recent: int = 6
+    summary_chars: int = 160
+
+    @classmethod
+    def from_env(cls) -> "MemoryPolicy":
+        return cls(
+            token_budget=int(os.getenv("WEATHER_MEMORY_TOKENS", "2000")),
+            keep_recent=int(os.getenv("WEATHER_MEMORY_RECENT", "6")),
+        )
+
+    def compact(self, messages: list) -> list:
+        """Return a compacted copy of ``messages`` that fits the token budget."""
+        split = max(0, len(messages) - self.keep_recent)
+        older, recent = messages[:split], messages[split:]
+
+        # Newest readings win; remember which cities the recent window covers
+        seen = {city for m in recent if (city := reading_city(m))}
+        kept = []
+        drop_question = False
+        for message in reversed(older):
+            if message.type == "system":
+                kept.append(message)
+                continue
+            if drop_question and message.type == "human":
+                drop_question = False
+                continue
+            drop_question = False
+            city = reading_city(message)
+            if city in seen:
+                # Superseded reading: drop it together with the question that asked for it
+                drop_question = True
+                continue
+            if city:
+                seen.add(city)
+            if message.type == "tool" or city:
+                summary = summarize(message, city, self.summary_chars)
+                if summary != _text(message):
+                    message = _with_content(message, summary)
+            kept.append(message)
+        compacted = kept[::-1] + recent
+
+        # Evict the oldest non-system messages until the budget is met
+        total = sum(message_tokens(m) for m in compacted)
+        index = 0
+        while total > self.token_budget and index < len(compacted) - self.keep_recent:
+            if compacted[index].type == "system":
+                index += 1
+                continue
+            total -= message_tokens(compacted.pop(index))
+
+        metrics.gauge("memory.prompt_tokens", total)
+        metrics.gauge("memory.messages", len(compacted))
+        return compacted
+
+    def apply(self, agent) -> None:
+        """Compact an MCPAgent's conversation history in place."""
+        history = agent.get_conversation_history()
+        compacted = self.compact(history)
+        if len(compacted) == len(history) and all(a is b for a, b in zip(compacted, history)):
+            return
+        agent.clear_conversation_history()
+        # clear_conversation_history() re-adds the system message on its own
+        kept = agent.get_conversation_history()
+        for message in compacted:
+            if not any(message is existing for existing in kept):
+                agent.add_to_history(message)
+        metrics.incr("memory.compactions")
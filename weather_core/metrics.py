@@ -0,0 +1,76 @@
+"""
+Tiny in-process metrics registry.
+
+Counters and latency samples are kept per process and can be dumped with
+``snapshot()`` for CLI ``stats`` commands, logs or an MCP resource.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Thread-safe counters, gauges and latency summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._gauges = {}
+        self._timings = defaultdict(list)
+
+    def incr(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._timings[name]
+            samples.append(seconds)
+            if len(samples) > 1000:  # keep the most recent window only
+                del samples[:500]
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """Return counters, gauges and p50/p95 latencies in milliseconds."""
+        with self._lock:
+            timings = {}
+            for name, samples in self._timings.items():
+                ordered = sorted(samples)
+                timings[name] = {
+                    "count": len(ordered),
+                    "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+                    "p95_ms": round(ordered[int(len(ordered) * 0.95)] * 1000, 2),
+                }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": timings,
+            }
+
+    def format(self) -> str:
+        """Render the snapshot as short human-readable lines."""
+        snap = self.snapshot()
+        lines = [f"{name}: {value}" for name, value in sorted(snap["counters"].items())]
+        lines += [f"{name}: {value}" for name, value in sorted(snap["gauges"].items())]
+        lines += [
+            f"{name}: n={t['count']} p50={t['p50_ms']}ms p95={t['p95_ms']}ms"
+            for name, t in sorted(snap["timings"].items())
+        ]
+        return "\n".join(lines) or "No metrics recorded yet."
+
+
+# Process-wide registry
+metrics = Metrics()
@@ -0,0 +1,80 @@
+"""
+Compact weather records shared by the providers, the cache and every consumer.
+
+Providers decode upstream response bytes straight into these types with
+msgspec's typed JSON decoder (see ``weather_core.providers``). Fields the app
+never reads are skipped by the decoder instead of being built into a dict tree
+and thrown away. The records are immutable structs with ``__slots__``, not
+tracked by the garbage collector, and repeated strings (conditions, icon codes)
+are interned. A cached observation is a few hundred bytes instead of the few
+kilobytes of a ``json.loads`` tree; ``benchmarks/decode_models.py`` measures
+both.
+
+The SQLite cache stores records as tagged JSON arrays (``encode``/``decode``)
+with the payload ``digest`` as the last element.
+"""
+
+import sys
+from datetime import datetime, timezone
+
+import msgspec
+
+
+class Observation(msgspec.Struct, frozen=True, array_like=True, gc=False, tag="obs"):
+    """Current conditions for one city."""
+    city: str
+    provider: str
+    dt: int  # Unix seconds of the observation
+    temp_c: float
+    feels_like_c: float
+    humidity_pct: int
+    pressure_hpa: float
+    wind_mps: float
+    condition: str  # lower case, e.g. "light rain"
+    icon: str  # OWM icon code, e.g. "10d"
+    digest: str = ""  # hash of the upstream payload
+
+
+class ForecastPoint(msgspec.Struct, frozen=True, array_like=True, gc=False):
+    """One 3-hour forecast slot."""
+    dt: int  # Unix seconds at the start of the slot
+    temp_c: float
+    feels_like_c: float
+    humidity_pct: int
+    pressure_hpa: float
+    wind_mps: float
+    condition: str
+    icon: str
+    rain_mm: float = 0.0  # over the 3 hours
+
+    @property
+    def dt_txt(self) -> str:
+        """UTC, "YYYY-MM-DD HH:MM:SS", as in OWM ``/forecast``."""
+        return datetime.fromtimestamp(self.dt, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class Forecast(msgspec.Struct, frozen=True, array_like=True, gc=False, tag="forecast"):
+    """3-hourly forecast for one city, soonest slot first."""
+    city: str
+    provider: str
+    points: tuple[ForecastPoint, ...]
+    digest: str = ""
+
+
+def condition(description: str, icon: str) -> tuple[str, str]:
+    """Interned condition strings; every record with the same weather shares them."""
+    return sys.intern(description), sys.intern(icon)
+
+
+_encoder = msgspec.json.Encoder()
+_decoder = msgspec.json.Decoder(Observation | Forecast)
+
+
+def encode(record: Observation | Forecast) -> bytes:
+    """Serialize a record for the cache."""
+    return _encoder.encode(record)
+
+
+def decode(data: bytes | str) -> Observation | Forecast:
+    """Inverse of ``encode``; raises ``msgspec.DecodeError`` for anything else."""
+    return _decoder.decode(data)
@@ -0,0 +1,165 @@
+"""
+Warm pool of stdio MCP server processes.
+
+Starting a stdio weather server costs an interpreter start, the mcp/httpx/
+dotenv imports and the MCP handshake — hundreds of milliseconds per agent
+session. ``StdioServerPool`` keeps a few servers started and initialized so
+new sessions lease one instantly and hand it back when they are done.
+
+Each pooled server is owned by its own task, which enters the stdio and
+ClientSession context managers and exits them again; leasers only borrow the
+session. Servers are health-checked with MCP pings while idle and recycled
+after ``max_calls`` tool calls; replacements start in background tasks that
+``close()`` cancels along with every server.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from weather_core.metrics import metrics
+
+logger = logging.getLogger("weather.pool")
+
+
+@dataclass
+class PooledServer:
+    """One running stdio server with an initialized session."""
+    session: ClientSession
+    init_result: object
+    calls: int = 0
+    _closed: asyncio.Event = field(default_factory=asyncio.Event)
+    _task: asyncio.Task | None = None
+
+    async def call_tool(self, name: str, arguments: dict):
+        self.calls += 1
+        return await self.session.call_tool(name, arguments)
+
+    async def close(self) -> None:
+        self._closed.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+@dataclass
+class PoolConfig:
+    size: int = 2
+    max_calls: int = 200
+    health_interval_s: float = 30.0
+    start_timeout_s: float = 30.0
+
+
+class StdioServerPool:
+    """Pre-started stdio MCP servers that sessions lease and return."""
+
+    def __init__(self, params: StdioServerParameters, config: PoolConfig | None = None):
+        self.params = params
+        self.config = config or PoolConfig()
+        self._idle: asyncio.Queue[PooledServer] = asyncio.Queue()
+        self._owners: set[asyncio.Task] = set()
+        self._spawning: set[asyncio.Task] = set()
+        self._health_task: asyncio.Task | None = None
+        self._closing = False
+
+    @classmethod
+    def from_config_file(cls, path: str, server_name: str, config: PoolConfig | None = None) -> "StdioServerPool":
+        """Build a pool from an ``mcpServers`` config file such as server/weather.json."""
+        with open(path) as f:
+            server = json.load(f)["mcpServers"][server_name]
+        params = StdioServerParameters(command=server["command"], args=server.get("args", []), env=server.get("env"))
+        return cls(params, config)
+
+    async def start(self) -> None:
+        """Fill the pool and start the background health checks."""
+        await asyncio.gather(*(self._spawn() for _ in range(self.config.size)))
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _spawn(self) -> bool:
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(self._own(ready))
+        self._owners.add(task)
+        task.add_done_callback(self._owners.discard)
+        try:
+            server = await asyncio.wait_for(asyncio.shield(ready), self.config.start_timeout_s)
+        except Exception as e:
+            logger.warning("Pooled server failed to start: %s", e)
+            metrics.incr("pool.start_failed")
+            task.cancel()
+            return False
+        server._task = task
+        metrics.incr("pool.started")
+        await self._idle.put(server)
+        return True
+
+    async def _own(self, ready: asyncio.Future) -> None:
+        """Run one server for its whole life inside a single task."""
+        try:
+            async with stdio_client(self.params) as (read_stream, write_stream):
+                async with ClientSession(read_stream, write_stream) as session:
+                    init_result = await session.initialize()
+                    server = PooledServer(session, init_result)
+                    ready.set_result(server)
+                    await server._closed.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+
+    def _replace(self) -> None:
+        """Start a replacement server in the background."""
+        task = asyncio.create_task(self._spawn())
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    async def lease(self) -> PooledServer:
+        """Take a ready server, starting one on demand if the pool is empty."""
+        if self._idle.empty():
+            metrics.incr("pool.miss")
+            if not await self._spawn():
+                raise RuntimeError(f"Could not start MCP server: {self.params.command}")
+        else:
+            metrics.incr("pool.hit")
+        return await self._idle.get()
+
+    async def release(self, server: PooledServer) -> None:
+        """Return a leased server; worn-out servers are replaced in the background."""
+        if self._closing or server.calls >= self.config.max_calls or server._task.done():
+            metrics.incr("pool.recycled")
+            await server.close()
+            if not self._closing:
+                self._replace()
+            return
+        await self._idle.put(server)
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.health_interval_s)
+            for _ in range(self._idle.qsize()):
+                server = self._idle.get_nowait()
+                try:
+                    await asyncio.wait_for(server.session.send_ping(), timeout=5.0)
+                except Exception:
+                    metrics.incr("pool.unhealthy")
+                    await server.close()
+                    self._replace()
+                else:
+                    await self._idle.put(server)
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._health_task:
+            self._health_task.cancel()
+        spawning = list(self._spawning)
+        for task in spawning:
+            task.cancel()
+        await asyncio.gather(*spawning, return_exceptions=True)
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
+        # Servers still leased, or half-started by a cancelled replacement
+        owners = list(self._owners)
+        for task in owners:
+            task.cancel()
+        await asyncio.gather(*owners, return_exceptions=True)
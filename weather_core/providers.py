@@ -0,0 +1,503 @@
+"""
+Pluggable weather backends behind one fetch interface.
+
+Every backend answers ``current(city)`` and ``forecast(city)`` with the same
+records, ``Observation`` and ``Forecast`` from ``weather_core.models``, whose
+``provider`` field names who answered. HTTP backends decode the response
+bytes straight into typed msgspec structs that declare only the fields the
+app uses, so the rest of the document is skipped, not materialized. The cache
+and the alert engine therefore work unchanged whichever backend answered.
+
+Backends:
+
+* ``owm``: OpenWeatherMap ``/data/2.5`` (needs ``OPENWEATHER_API_KEY``)
+* ``open-meteo``: Open-Meteo, keyless, looked up by city coordinates
+* ``local``: deterministic synthetic weather, for offline development
+
+``ProviderChain`` tracks each backend's latency (an exponentially weighted
+moving average, with failures counted as a full timeout) and tries them
+fastest first. In ``race`` mode the two fastest are asked at once and the
+first valid answer wins; the other request is cancelled. When every backend
+fails with a transient error the whole pass is retried, with jittered
+backoff, within the process retry budget (``weather_core.retry``) and the
+caller's deadline (``weather_core.deadlines``). Each attempt's timeout is
+cut to the time the caller has left.
+
+HTTP backends send ``If-None-Match``/``If-Modified-Since`` when the upstream
+gave validators, and hash every body they receive. A 304, or a body identical
+to the last one for the same request, returns the previous record without
+decoding JSON again (less any forecast slots that have passed since, see
+``_trim``). Results carry that hash as ``digest`` so the
+cache can tell an unchanged payload from a new one without comparing them.
+
+Configured with ``WEATHER_PROVIDERS`` (comma-separated, in preference order,
+default ``owm,open-meteo``), ``WEATHER_PROVIDER_MODE`` (``failover`` or
+``race``), ``WEATHER_PROVIDER_TIMEOUT_S`` and ``WEATHER_PROVIDER_RETRIES``. Upstream traffic can be
+recorded and replayed offline, see ``weather_core.cassette``.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import random
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+import msgspec
+
+from weather_core.cassette import Cassette, cassette_from_env
+from weather_core.cities import CITY_COORDINATES
+from weather_core.deadlines import remaining
+from weather_core.metrics import metrics
+from weather_core.models import Forecast, ForecastPoint, Observation, condition
+from weather_core.retry import RetryBudget, backoff_delay, retry_budget, retryable
+
+logger = logging.getLogger("weather.providers")
+
+SLOT_S = 3 * 3600
+FORECAST_SLOTS = 40  # five days of 3-hour slots, like OWM /forecast
+
+
+class _Main(msgspec.Struct):
+    temp: float
+    feels_like: float
+    humidity: float
+    pressure: float
+
+
+class _Wind(msgspec.Struct):
+    speed: float = 0.0
+
+
+class _Condition(msgspec.Struct):
+    description: str
+    icon: str
+
+
+class _Rain(msgspec.Struct):
+    three_hours: float = msgspec.field(name="3h", default=0.0)
+
+
+class _OwmStep(msgspec.Struct):
+    """An OWM ``/weather`` response, or one ``/forecast`` list item; other fields are skipped."""
+    dt: int
+    main: _Main
+    weather: list[_Condition]
+    wind: _Wind = msgspec.field(default_factory=_Wind)
+    rain: _Rain | None = None
+
+
+class _OwmForecast(msgspec.Struct):
+    list: list[_OwmStep]
+
+
+class _MeteoCurrent(msgspec.Struct):
+    time: int
+    temperature_2m: float
+    apparent_temperature: float
+    relative_humidity_2m: float
+    pressure_msl: float
+    wind_speed_10m: float
+    weather_code: int
+    is_day: int
+
+
+class _MeteoHourly(msgspec.Struct):
+    time: list[int]
+    temperature_2m: list[float]
+    apparent_temperature: list[float]
+    relative_humidity_2m: list[float]
+    pressure_msl: list[float]
+    wind_speed_10m: list[float]
+    weather_code: list[int]
+    is_day: list[int]
+    precipitation: list[float | None]
+
+
+class _MeteoResponse(msgspec.Struct):
+    current: _MeteoCurrent | None = None
+    hourly: _MeteoHourly | None = None
+
+
+class ProviderError(Exception):
+    """A backend could not answer for this city."""
+
+
+@dataclass
+class _Seen:
+    """The last response to one request: its validators, body hash and decoded record."""
+    etag: str | None
+    last_modified: str | None
+    digest: str
+    value: Observation | Forecast
+
+
+class WeatherProvider:
+    """Base class for weather backends."""
+
+    name = "base"
+    volatile: re.Pattern | None = None  # parts of a response body that differ on every request
+
+    def __init__(self):
+        self._seen: dict[str, _Seen] = {}
+
+    async def _get_decoded(self, client: httpx.AsyncClient, url: str, params: dict,
+                           decode: Callable[[bytes], Observation | Forecast]) -> Observation | Forecast:
+        """GET a JSON document and decode it, skipping both when it has not changed."""
+        key = f"{url}?{sorted(params.items())}"
+        seen = self._seen.get(key)
+        headers = {}
+        if seen and seen.etag:
+            headers["If-None-Match"] = seen.etag
+        if seen and seen.last_modified:
+            headers["If-Modified-Since"] = seen.last_modified
+        response = await client.get(url, params=params, headers=headers)
+        if response.status_code == 304 and seen:
+            metrics.incr(f"provider.{self.name}.not_modified")
+            return self._trim(seen.value)
+        response.raise_for_status()
+        body = self.volatile.sub(b"", response.content) if self.volatile else response.content
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        if seen and seen.digest == digest:
+            metrics.incr(f"provider.{self.name}.unchanged")
+            value = seen.value
+        else:
+            value = msgspec.structs.replace(decode(response.content), digest=digest)
+        self._seen[key] = _Seen(response.headers.get("etag"), response.headers.get("last-modified"), digest, value)
+        return self._trim(value)
+
+    def _trim(self, value: Observation | Forecast) -> Observation | Forecast:
+        """Drop what has gone out of date since ``value`` was decoded.
+
+        Applied on every return, so a record reused for an unchanged payload
+        is as current as a freshly decoded one.
+        """
+        return value
+
+    async def current(self, city: str, client: httpx.AsyncClient) -> Observation:
+        raise NotImplementedError
+
+    async def forecast(self, city: str, client: httpx.AsyncClient) -> Forecast:
+        raise NotImplementedError
+
+
+class OpenWeatherMapProvider(WeatherProvider):
+    name = "owm"
+    base_url = "https://api.openweathermap.org/data/2.5"
+    _current_decoder = msgspec.json.Decoder(_OwmStep)
+    _forecast_decoder = msgspec.json.Decoder(_OwmForecast)
+
+    def __init__(self, api_key: str):
+        super().__init__()
+        self.api_key = api_key
+
+    async def _get(self, client: httpx.AsyncClient, path: str, city: str,
+                   decode: Callable[[bytes], Observation | Forecast]) -> Observation | Forecast:
+        params = {"q": f"{city},IN", "appid": self.api_key, "units": "metric"}
+        return await self._get_decoded(client, f"{self.base_url}/{path}", params, decode)
+
+    @staticmethod
+    def _condition(step: _OwmStep) -> tuple[str, str]:
+        if not step.weather:
+            return condition("unknown", "03d")
+        return condition(step.weather[0].description, step.weather[0].icon)
+
+    async def current(self, city: str, client: httpx.AsyncClient) -> Observation:
+        return await self._get(client, "weather", city, lambda body: self._current(city, body))
+
+    def _current(self, city: str, body: bytes) -> Observation:
+        raw = self._current_decoder.decode(body)
+        main = raw.main
+        return Observation(
+            city, self.name, raw.dt, main.temp, main.feels_like, round(main.humidity), main.pressure,
+            raw.wind.speed, *self._condition(raw),
+        )
+
+    async def forecast(self, city: str, client: httpx.AsyncClient) -> Forecast:
+        return await self._get(client, "forecast", city, lambda body: self._forecast(city, body))
+
+    def _forecast(self, city: str, body: bytes) -> Forecast:
+        points = tuple(
+            ForecastPoint(
+                step.dt, step.main.temp, step.main.feels_like, round(step.main.humidity), step.main.pressure,
+                step.wind.speed, *self._condition(step), step.rain.three_hours if step.rain else 0.0,
+            )
+            for step in self._forecast_decoder.decode(body).list
+        )
+        return Forecast(city, self.name, points)
+
+
+# WMO weather interpretation codes -> (description, OWM icon without day/night suffix)
+WMO_CODES = {
+    0: ("clear sky", "01"), 1: ("mainly clear", "02"), 2: ("partly cloudy", "03"), 3: ("overcast clouds", "04"),
+    45: ("fog", "50"), 48: ("depositing rime fog", "50"),
+    51: ("light drizzle", "09"), 53: ("drizzle", "09"), 55: ("dense drizzle", "09"),
+    56: ("freezing drizzle", "09"), 57: ("dense freezing drizzle", "09"),
+    61: ("light rain", "10"), 63: ("moderate rain", "10"), 65: ("heavy rain", "10"),
+    66: ("freezing rain", "13"), 67: ("heavy freezing rain", "13"),
+    71: ("light snow", "13"), 73: ("snow", "13"), 75: ("heavy snow", "13"), 77: ("snow grains", "13"),
+    80: ("light rain showers", "09"), 81: ("rain showers", "09"), 82: ("violent rain showers", "09"),
+    85: ("snow showers", "13"), 86: ("heavy snow showers", "13"),
+    95: ("thunderstorm", "11"), 96: ("thunderstorm with hail", "11"), 99: ("thunderstorm with heavy hail", "11"),
+}
+
+
+class OpenMeteoProvider(WeatherProvider):
+    name = "open-meteo"
+    url = "https://api.open-meteo.com/v1/forecast"
+    variables = "temperature_2m,relative_humidity_2m,apparent_temperature,is_day,weather_code,pressure_msl,wind_speed_10m"
+    volatile = re.compile(rb'"generationtime_ms":[0-9.eE+-]+,?')
+    _decoder = msgspec.json.Decoder(_MeteoResponse)
+
+    async def _get(self, client: httpx.AsyncClient, city: str, decode: Callable[[bytes], Observation | Forecast],
+                   **params) -> Observation | Forecast:
+        if city not in CITY_COORDINATES:
+            raise ProviderError(f"No coordinates for {city}")
+        lat, lon = CITY_COORDINATES[city]
+        params = {"latitude": lat, "longitude": lon, "wind_speed_unit": "ms", "timeformat": "unixtime", **params}
+        return await self._get_decoded(client, self.url, params, decode)
+
+    @staticmethod
+    def _condition(code: int, is_day: int) -> tuple[str, str]:
+        description, icon = WMO_CODES.get(int(code), ("unknown", "03"))
+        return condition(description, icon + ("d" if is_day else "n"))
+
+    async def current(self, city: str, client: httpx.AsyncClient) -> Observation:
+        return await self._get(client, city, lambda body: self._current(city, body), current=self.variables)
+
+    def _current(self, city: str, body: bytes) -> Observation:
+        now = self._decoder.decode(body).current
+        if now is None:
+            raise ProviderError(f"{self.name} returned no current conditions for {city}")
+        return Observation(
+            city, self.name, now.time, now.temperature_2m, now.apparent_temperature,
+            round(now.relative_humidity_2m), now.pressure_msl, now.wind_speed_10m,
+            *self._condition(now.weather_code, now.is_day),
+        )
+
+    async def forecast(self, city: str, client: httpx.AsyncClient) -> Forecast:
+        return await self._get(client, city, lambda body: self._forecast(city, body),
+                               hourly=self.variables + ",precipitation", forecast_days=6)
+
+    def _trim(self, value: Observation | Forecast) -> Observation | Forecast:
+        # The hourly series starts at midnight: slots pass while the payload stays the same
+        if not isinstance(value, Forecast):
+            return value
+        now = time.time()
+        points = tuple(point for point in value.points if point.dt > now)[:FORECAST_SLOTS]
+        if points == value.points:
+            return value
+        # A different first slot is a different forecast to the cache and the alert engine
+        digest = f"{value.digest}:{points[0].dt}" if points else value.digest
+        return msgspec.structs.replace(value, points=points, digest=digest)
+
+    def _forecast(self, city: str, body: bytes) -> Forecast:
+        hourly = self._decoder.decode(body).hourly
+        if hourly is None:
+            raise ProviderError(f"{self.name} returned no forecast for {city}")
+        points = []
+        for i, dt in enumerate(hourly.time):
+            # Resample the hourly series to OWM's 3-hour slots; _trim drops the past ones
+            if dt % SLOT_S:
+                continue
+            points.append(ForecastPoint(
+                dt,
+                hourly.temperature_2m[i],
+                hourly.apparent_temperature[i],
+                round(hourly.relative_humidity_2m[i]),
+                hourly.pressure_msl[i],
+                hourly.wind_speed_10m[i],
+                *self._condition(hourly.weather_code[i], hourly.is_day[i]),
+                round(sum(p or 0.0 for p in hourly.precipitation[max(0, i - 2):i + 1]), 2),
+            ))
+        return Forecast(city, self.name, tuple(points))
+
+
+class LocalProvider(WeatherProvider):
+    """Plausible, repeatable synthetic weather; no network access."""
+
+    name = "local"
+
+    def _sample(self, city: str, dt: int) -> tuple:
+        """(temp, feels like, humidity, pressure, wind, condition, icon) for one time."""
+        rng = random.Random(f"{city}:{dt // 3600}")
+        lat = CITY_COORDINATES.get(city, (20.0, 78.0))[0]
+        hour = (dt // 3600 + 5) % 24  # IST
+        temp = round(34 - 0.4 * (lat - 10) + 5 * math.sin((hour - 9) / 24 * 2 * math.pi) + rng.uniform(-1, 1), 1)
+        humidity = rng.randint(30, 90)
+        is_day = 6 <= hour < 18
+        code = rng.choice([0, 1, 2, 3, 61])
+        return (temp, round(temp + humidity / 40, 1), humidity, float(rng.randint(1002, 1014)),
+                round(rng.uniform(0.5, 6), 1), *OpenMeteoProvider._condition(code, is_day))
+
+    async def current(self, city: str, client: httpx.AsyncClient) -> Observation:
+        dt = int(time.time()) // 600 * 600  # a new observation every 10 minutes
+        return Observation(city, self.name, dt, *self._sample(city, dt))
+
+    async def forecast(self, city: str, client: httpx.AsyncClient) -> Forecast:
+        start = (int(time.time()) // SLOT_S + 1) * SLOT_S
+        points = tuple(
+            ForecastPoint(dt, *self._sample(city, dt))
+            for dt in range(start, start + FORECAST_SLOTS * SLOT_S, SLOT_S)
+        )
+        return Forecast(city, self.name, points)
+
+
+def _valid(kind: str, result: Observation | Forecast) -> bool:
+    if kind == "current":
+        return isinstance(result, Observation)
+    return isinstance(result, Forecast) and bool(result.points)
+
+
+class ProviderChain:
+    """Ask backends fastest first, or race the two fastest, until one answers."""
+
+    def __init__(self, providers: list[WeatherProvider], mode: str = "failover", timeout_s: float = 10.0,
+                 race_width: int = 2, alpha: float = 0.3, cassette: Cassette | None = None,
+                 max_retries: int = 2, budget: RetryBudget = retry_budget):
+        if not providers:
+            raise ValueError("At least one weather provider is required")
+        self.providers = list(providers)
+        self.mode = mode
+        self.timeout_s = timeout_s
+        self.race_width = race_width
+        self.alpha = alpha
+        self.cassette = cassette
+        self.max_retries = max_retries
+        self.budget = budget
+        self.latency: dict[str, float] = {}  # provider name -> EWMA seconds
+
+    @property
+    def names(self) -> list[str]:
+        return [provider.name for provider in self.providers]
+
+    def ordered(self) -> list[WeatherProvider]:
+        """Fastest first; providers not measured yet go first so they get measured."""
+        return sorted(self.providers, key=lambda p: self.latency.get(p.name, 0.0))
+
+    def _record(self, provider: WeatherProvider, seconds: float) -> None:
+        previous = self.latency.get(provider.name)
+        self.latency[provider.name] = seconds if previous is None else previous + self.alpha * (seconds - previous)
+
+    def _attempt_timeout(self) -> float:
+        left = remaining()
+        return self.timeout_s if left is None else min(self.timeout_s, left)
+
+    async def _call(self, provider: WeatherProvider, kind: str, city: str, client: httpx.AsyncClient) -> Observation | Forecast:
+        timeout = self._attempt_timeout()
+        if timeout <= 0:
+            raise TimeoutError("deadline passed")
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(getattr(provider, kind)(city, client), timeout)
+            if not _valid(kind, result):
+                raise ProviderError(f"{provider.name} returned no {kind} data for {city}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record(provider, self.timeout_s)
+            metrics.incr(f"provider.{provider.name}.errors")
+            logger.debug("%s failed for %s %s: %s", provider.name, kind, city, e)
+            raise
+        elapsed = time.perf_counter() - start
+        self._record(provider, elapsed)
+        metrics.observe(f"provider.{provider.name}_seconds", elapsed)
+        return result
+
+    async def _race(self, providers: list[WeatherProvider], kind: str, city: str, client: httpx.AsyncClient,
+                    errors: list[Exception]):
+        tasks = [asyncio.create_task(self._call(p, kind, city, client)) for p in providers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                metrics.incr(f"provider.{result.provider}.race_wins")
+                return result
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _pass(self, kind: str, city: str, client: httpx.AsyncClient, errors: list[Exception]) -> Observation | Forecast | None:
+        """One try of every backend: race or failover."""
+        providers = self.ordered()
+        if self.mode == "race" and len(providers) > 1:
+            result = await self._race(providers[:self.race_width], kind, city, client, errors)
+            if result is not None:
+                return result
+            providers = providers[self.race_width:]
+        for provider in providers:
+            try:
+                return await self._call(provider, kind, city, client)
+            except Exception as e:
+                errors.append(e)
+        return None
+
+    async def fetch(self, kind: str, city: str) -> Observation | Forecast | None:
+        """Return the first valid ``current`` or ``forecast`` answer, or None if every backend failed."""
+        self.budget.request()
+        transport = self.cassette.transport() if self.cassette else None
+        async with httpx.AsyncClient(timeout=self.timeout_s, transport=transport) as client:
+            for attempt in range(self.max_retries + 1):
+                errors = []
+                result = await self._pass(kind, city, client, errors)
+                if result is not None:
+                    return result
+                if attempt == self.max_retries or not any(retryable(e) for e in errors):
+                    break
+                delay = backoff_delay(attempt)
+                left = remaining()
+                if left is not None and left <= delay:
+                    metrics.incr("provider.retry.deadline")
+                    break
+                if not self.budget.try_spend():
+                    metrics.incr("provider.retry.budget_exhausted")
+                    break
+                metrics.incr("provider.retries")
+                await asyncio.sleep(delay)
+        metrics.incr("provider.exhausted")
+        return None
+
+    async def current(self, city: str) -> Observation | None:
+        return await self.fetch("current", city)
+
+    async def forecast(self, city: str) -> Forecast | None:
+        return await self.fetch("forecast", city)
+
+
+def providers_from_env(api_key: str | None = None) -> ProviderChain:
+    """Build the provider chain from ``WEATHER_PROVIDERS`` and friends."""
+    api_key = api_key or os.getenv("OPENWEATHER_API_KEY")
+    cassette = cassette_from_env()
+    if cassette and cassette.mode == "replay":
+        api_key = api_key or "replay"  # keys are not part of recorded requests
+    providers = []
+    for name in os.getenv("WEATHER_PROVIDERS", "owm,open-meteo").split(","):
+        name = name.strip().lower()
+        if name == "owm":
+            if api_key:
+                providers.append(OpenWeatherMapProvider(api_key))
+            else:
+                logger.warning("OPENWEATHER_API_KEY is not set; skipping the owm provider")
+        elif name == "open-meteo":
+            providers.append(OpenMeteoProvider())
+        elif name == "local":
+            providers.append(LocalProvider())
+        elif name:
+            raise ValueError(f"Unknown weather provider {name!r} (choose from owm, open-meteo, local)")
+    return ProviderChain(
+        providers or [OpenMeteoProvider()],
+        mode=os.getenv("WEATHER_PROVIDER_MODE", "failover").lower(),
+        timeout_s=float(os.getenv("WEATHER_PROVIDER_TIMEOUT_S", "10")),
+        cassette=cassette,
+        max_retries=int(os.getenv("WEATHER_PROVIDER_RETRIES", "2")),
+    )
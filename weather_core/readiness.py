@@ -0,0 +1,101 @@
+"""
+Startup helpers for the launch scripts.
+
+Only the standard library is used here: these helpers run before the
+dependency check has confirmed that anything else is installed.
+
+``missing_distributions`` looks packages up in the installed metadata instead
+of importing them, so checking pandas or plotly costs microseconds rather than
+seconds. ``wait_until_ready`` polls HTTP health endpoints until every service
+answers, one of them exits, or the deadline passes.
+
+    python -m weather_core.readiness http://localhost:8000/health --timeout 30
+"""
+
+import argparse
+import logging
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from importlib import invalidate_caches
+from importlib.metadata import PackageNotFoundError, version
+
+logger = logging.getLogger("weather.readiness")
+
+
+def missing_distributions(names: list[str]) -> list[str]:
+    """Return the distributions in ``names`` that are not installed."""
+    invalidate_caches()  # see packages pip installed since the last call
+    missing = []
+    for name in names:
+        try:
+            version(name)
+        except PackageNotFoundError:
+            missing.append(name)
+    return missing
+
+
+def probe(url: str, timeout: float = 1.0) -> bool:
+    """True when ``url`` answers with a 2xx status."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return 200 <= response.status < 300
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+@dataclass
+class Service:
+    """A launched process and the URL that reports it ready."""
+
+    name: str
+    health_url: str
+    process: subprocess.Popen | None = None
+
+
+def wait_until_ready(services: list[Service], timeout: float = 30.0, interval: float = 0.1) -> dict[str, float]:
+    """Poll every service until all are ready.
+
+    Returns the seconds each service took to answer its health check. Raises
+    RuntimeError as soon as a process exits, and TimeoutError listing the
+    services still pending once ``timeout`` has passed.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    pending = list(services)
+    ready = {}
+    while pending:
+        for service in list(pending):
+            if service.process is not None and service.process.poll() is not None:
+                raise RuntimeError(f"{service.name} exited with code {service.process.returncode} before it was ready")
+            if probe(service.health_url, timeout=min(1.0, max(deadline - time.perf_counter(), 0.05))):
+                ready[service.name] = time.perf_counter() - start
+                pending.remove(service)
+                logger.info("%s ready in %.0f ms", service.name, ready[service.name] * 1000)
+        if not pending:
+            break
+        if time.perf_counter() >= deadline:
+            raise TimeoutError(f"Not ready after {timeout:.0f}s: {', '.join(s.name for s in pending)}")
+        time.sleep(interval)
+    return ready
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wait for HTTP health endpoints to answer")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    try:
+        ready = wait_until_ready([Service(url, url) for url in args.urls], timeout=args.timeout)
+    except TimeoutError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+    for url, seconds in ready.items():
+        print(f"{url} ready in {seconds * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
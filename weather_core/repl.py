@@ -0,0 +1,202 @@
+"""
+Asyncio-native line input for the chat REPLs.
+
+``input()`` blocks the thread that runs the event loop, so while the user is
+typing nothing else runs: no prefetch, no keep-alive, and pooled connections
+go stale. ``LineReader.readline`` waits for the line without blocking the loop.
+On a terminal it reads key by key (``add_reader`` on POSIX, ``msvcrt`` polling
+on Windows) and does its own echo and line editing, so it can report the
+partial line after every keystroke. When stdin is a pipe it reads whole lines
+in a worker thread.
+
+``Prefetcher`` uses those partial lines to start fetching each city as soon as
+its name has been typed; the answer then awaits the fetch already in flight
+instead of starting one after Enter.
+"""
+
+import asyncio
+import codecs
+import os
+import sys
+import time
+from collections.abc import Awaitable, Callable
+
+from weather_core.deadlines import remaining
+from weather_core.intents import extract
+from weather_core.metrics import metrics
+from weather_core.router import tool_for
+
+
+class _LineEditor:
+    """Minimal line discipline: printable input, backspace, Ctrl-U, Ctrl-C, Ctrl-D."""
+
+    def __init__(self, on_change: Callable[[str], None] | None):
+        self.on_change = on_change
+        self.chars: list[str] = []
+        self.escape = 0  # inside an escape sequence (arrow keys etc.), which are ignored
+
+    def _echo(self, text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def feed(self, text: str) -> str | None:
+        """Apply typed characters; return the line once Enter is pressed."""
+        changed = False
+        try:
+            for ch in text:
+                if self.escape == 1:
+                    self.escape = 2 if ch in "[O" else 0
+                    continue
+                if self.escape == 2:
+                    if ch.isalpha() or ch == "~":
+                        self.escape = 0
+                    continue
+                if ch == "\x1b":
+                    self.escape = 1
+                elif ch in "\r\n":
+                    self._echo("\n")
+                    return "".join(self.chars)
+                elif ch == "\x03":
+                    self._echo("^C\n")
+                    raise KeyboardInterrupt
+                elif ch == "\x04":
+                    if not self.chars:
+                        self._echo("\n")
+                        raise EOFError
+                elif ch in "\x7f\x08":
+                    if self.chars:
+                        self.chars.pop()
+                        self._echo("\b \b")
+                        changed = True
+                elif ch == "\x15":
+                    self._echo("\b \b" * len(self.chars))
+                    self.chars.clear()
+                    changed = True
+                elif ch.isprintable():
+                    self.chars.append(ch)
+                    self._echo(ch)
+                    changed = True
+            return None
+        finally:
+            if changed and self.on_change is not None:
+                self.on_change("".join(self.chars))
+
+
+class LineReader:
+    """``await reader.readline(prompt)`` in place of ``input(prompt)``.
+
+    Raises ``EOFError`` and ``KeyboardInterrupt`` like ``input()``. ``on_change``
+    is called with the partial line after each edit (terminals only).
+    """
+
+    def __init__(self, on_change: Callable[[str], None] | None = None):
+        self.on_change = on_change
+
+    async def readline(self, prompt: str = "") -> str:
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        if not sys.stdin.isatty():
+            line = await asyncio.to_thread(sys.stdin.readline)
+            if not line:
+                raise EOFError
+            return line.rstrip("\r\n")
+        if os.name == "nt":
+            return await self._read_windows()
+        return await self._read_posix()
+
+    async def _read_posix(self) -> str:
+        import termios
+
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        raw = termios.tcgetattr(fd)
+        # No kernel echo or line buffering; Ctrl-C arrives as a character
+        raw[3] &= ~(termios.ICANON | termios.ECHO | termios.ISIG)
+        raw[6][termios.VMIN], raw[6][termios.VTIME] = 1, 0
+        termios.tcsetattr(fd, termios.TCSANOW, raw)
+
+        loop = asyncio.get_running_loop()
+        line = loop.create_future()
+        editor = _LineEditor(self.on_change)
+        decoder = codecs.getincrementaldecoder(sys.stdin.encoding or "utf-8")(errors="replace")
+
+        def on_readable():
+            if line.done():
+                return
+            try:
+                data = os.read(fd, 1024)
+                if not data:
+                    raise EOFError
+                result = editor.feed(decoder.decode(data))
+            except BaseException as e:
+                line.set_exception(e)
+                return
+            if result is not None:
+                line.set_result(result)
+
+        loop.add_reader(fd, on_readable)
+        try:
+            return await line
+        finally:
+            loop.remove_reader(fd)
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    async def _read_windows(self) -> str:
+        import msvcrt
+
+        editor = _LineEditor(self.on_change)
+        while True:
+            while msvcrt.kbhit():
+                ch = msvcrt.getwch()
+                if ch in "\x00\xe0":  # function and arrow keys send a second code
+                    msvcrt.getwch()
+                    continue
+                result = editor.feed(ch)
+                if result is not None:
+                    return result
+            await asyncio.sleep(0.02)
+
+
+class Prefetcher:
+    """Start fetching the cities in a question while it is still being typed.
+
+    ``fetchers`` maps ``"weather"`` and ``"forecast"`` (and optionally
+    ``"snapshot"``) to coroutines taking a city; the kind prefetched is the
+    tool ``weather_core.router`` would pick for the question. ``on_change`` starts a fetch for each city in the partial line, at
+    most once per ``max_age_s``. ``get`` returns the prefetched result if there
+    is one, otherwise fetches now.
+    """
+
+    def __init__(self, fetchers: dict[str, Callable[[str], Awaitable]], max_age_s: float = 60.0,
+                 max_cities: int = 5):
+        self.fetchers = fetchers
+        self.max_age_s = max_age_s
+        self.max_cities = max_cities
+        self._started: dict[tuple[str, str], tuple[float, asyncio.Future]] = {}
+
+    def on_change(self, text: str) -> None:
+        found = extract(text)
+        kind = tool_for(found.intents).removeprefix("get_")
+        if kind not in self.fetchers:
+            kind = "forecast" if "forecast" in found.intents else "weather"
+        for city in found.cities[:self.max_cities]:
+            self.start(kind, city)
+
+    def start(self, kind: str, city: str) -> None:
+        started = self._started.get((kind, city))
+        if started and time.monotonic() - started[0] < self.max_age_s:
+            return
+        task = asyncio.ensure_future(self.fetchers[kind](city))
+        # A prefetch nobody asks for must not log "exception was never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._started[(kind, city)] = (time.monotonic(), task)
+        metrics.incr("repl.prefetch")
+
+    async def get(self, kind: str, city: str):
+        started = self._started.pop((kind, city), None)
+        if started is None or time.monotonic() - started[0] >= self.max_age_s:
+            return await self.fetchers[kind](city)
+        metrics.incr("repl.prefetch_hit")
+        if started[1].done():
+            metrics.incr("repl.prefetch_ready")
+        return await asyncio.wait_for(asyncio.shield(started[1]), remaining())
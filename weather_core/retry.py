@@ -0,0 +1,68 @@
+"""
+Retry policy for upstream weather requests.
+
+Retries back off exponentially with full jitter, so callers that failed
+together do not retry together. They are also limited by a per-process
+``RetryBudget``: each first attempt earns a fraction of a retry (10% by
+default), plus a small steady allowance. An upstream outage then costs at
+most about 10% extra traffic rather than multiplying the load by the retry
+count.
+"""
+
+import os
+import random
+import threading
+import time
+
+import httpx
+
+
+def retryable(error: BaseException) -> bool:
+    """Timeouts, connection failures, 429 and 5xx are worth retrying; other errors will repeat."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+def backoff_delay(attempt: int, base_s: float = 0.2, max_s: float = 5.0) -> float:
+    """Full-jitter exponential backoff before retry number ``attempt + 1``."""
+    return random.uniform(0, min(max_s, base_s * 2 ** attempt))
+
+
+class RetryBudget:
+    """Token bucket that retries spend and first attempts refill."""
+
+    def __init__(self, ratio: float = 0.1, min_per_s: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_s = min_per_s
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "RetryBudget":
+        return cls(ratio=float(os.getenv("WEATHER_RETRY_RATIO", "0.1")))
+
+    def _refill(self, amount: float) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + amount + (now - self._updated) * self.min_per_s)
+        self._updated = now
+
+    def request(self) -> None:
+        """Record a first attempt."""
+        with self._lock:
+            self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget, if there is one."""
+        with self._lock:
+            self._refill(0.0)
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+# Shared by every provider chain in the process
+retry_budget = RetryBudget.from_env()
@@ -0,0 +1,83 @@
+"""
+Deterministic pre-router for the agent chat.
+
+Simple single-city questions ("Delhi", "weather in Pune", "forecast for
+Mumbai", "Pune now and later") are mapped straight to an MCP tool call,
+skipping the LLM round-trip; asking about both now and later maps to the
+get_snapshot tool. Anything compound or ambiguous is left for the agent.
+
+Cities and intents are found by ``weather_core.intents``, the same extractor
+the prefetcher uses, so a question is routed to the tool that was prefetched
+while it was typed.
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+
+from weather_core.intents import TERM_PATTERN, extract
+
+# Intents that need more than one city's current weather or forecast
+AGENT_INTENTS = {"compare", "help"}
+
+# Words that may appear around the city and intent keywords without changing the question
+FILLER_WORDS = {
+    "what", "whats", "what's", "how", "hows", "how's", "is", "the", "in", "for", "of", "at",
+    "weather", "today", "right", "like", "it", "its", "it's", "conditions", "please", "tell",
+    "me", "show", "get", "give", "city", "and", "then",
+}
+
+_WORD = re.compile(r"[a-z']+")
+
+
+@dataclass(frozen=True)
+class Route:
+    """A tool call that answers a query without the LLM."""
+    tool: str
+    arguments: dict
+
+
+@dataclass
+class RouterConfig:
+    """Knobs for the pre-router; defaults can be overridden from the environment."""
+    enabled: bool = True
+    max_words: int = 8
+    extra_filler: set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_env(cls) -> "RouterConfig":
+        extra = os.getenv("WEATHER_ROUTER_FILLER", "")
+        return cls(
+            enabled=os.getenv("WEATHER_ROUTER", "1").lower() not in {"0", "false", "off"},
+            max_words=int(os.getenv("WEATHER_ROUTER_MAX_WORDS", "8")),
+            extra_filler={word.strip().lower() for word in extra.split(",") if word.strip()},
+        )
+
+
+def tool_for(intents: frozenset[str]) -> str:
+    """The tool answering a single-city question with these intents."""
+    if "forecast" in intents:
+        return "get_snapshot" if "current" in intents else "get_forecast"
+    return "get_weather"
+
+
+class QueryRouter:
+    """Decide whether a chat input can skip the agent and call a tool directly."""
+
+    def __init__(self, config: RouterConfig | None = None):
+        self.config = config or RouterConfig()
+        self.filler = FILLER_WORDS | self.config.extra_filler
+
+    def route(self, text: str) -> Route | None:
+        """Return a Route for simple single-city queries, or None to use the agent."""
+        if not self.config.enabled:
+            return None
+        found = extract(text)
+        if len(found.cities) != 1 or found.intents & AGENT_INTENTS:
+            return None
+        words = _WORD.findall(TERM_PATTERN.sub(" ", text.lower()))
+        if len(words) > self.config.max_words:
+            return None
+        if any(word not in self.filler for word in words):
+            return None
+        return Route(tool_for(found.intents), {"city": found.cities[0], "include_text": True})
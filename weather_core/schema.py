@@ -0,0 +1,218 @@
+"""
+Typed result schemas for the weather MCP tools.
+
+Tools return these as MCP structured content, so agents and the Streamlit app
+read numbers directly instead of parsing prose. The human-readable rendering
+is only attached when a caller asks for it.
+"""
+
+import time
+
+from typing_extensions import NotRequired, TypedDict
+
+from weather_core.models import Forecast, Observation
+
+
+class WeatherReport(TypedDict):
+    """Current conditions for one city."""
+    city: str
+    temp_c: float
+    feels_like_c: float
+    humidity_pct: int
+    wind_mps: float
+    condition: str
+    observed_at: int  # Unix seconds, as reported upstream (OWM ``dt``)
+    age_s: int  # Seconds between ``observed_at`` and when the report was built
+    text: NotRequired[str | None]  # only filled in when include_text is set
+
+
+class ForecastStep(TypedDict):
+    """One 3-hour forecast slot."""
+    at: int  # Unix seconds
+    temp_c: float
+    condition: str
+
+
+class ForecastReport(TypedDict):
+    """Short-range forecast for one city."""
+    city: str
+    steps: list[ForecastStep]
+    text: NotRequired[str | None]
+
+
+class ForecastSummary(TypedDict):
+    """The next few forecast slots and their range."""
+    hours: int
+    min_temp_c: float
+    max_temp_c: float
+    rain_mm: float  # total over the period
+    steps: list[ForecastStep]
+
+
+class CitySnapshot(TypedDict):
+    """Current conditions and the forecast summary for one city, from one tool call.
+
+    A part whose data could not be fetched is left out (null in the tool result).
+    """
+    city: str
+    current: NotRequired[WeatherReport | None]
+    forecast: NotRequired[ForecastSummary | None]
+    text: NotRequired[str | None]
+
+
+class WeatherAlert(TypedDict):
+    """One threshold rule triggered by one city's forecast slot."""
+    rule: str
+    city: str
+    severity: str
+    at: int  # Unix seconds of the forecast slot
+    value: float
+    threshold: float
+    message: str
+
+
+class AlertsReport(TypedDict):
+    """Active alerts, soonest first."""
+    alerts: list[WeatherAlert]
+    text: NotRequired[str | None]
+
+
+def weather_report(city: str, data: Observation, now: float | None = None) -> WeatherReport:
+    """Build a WeatherReport from a provider observation."""
+    now = time.time() if now is None else now
+    observed_at = int(data.dt or now)
+    return WeatherReport(
+        city=city,
+        temp_c=data.temp_c,
+        feels_like_c=data.feels_like_c,
+        humidity_pct=data.humidity_pct,
+        wind_mps=data.wind_mps,
+        condition=data.condition.title(),
+        observed_at=observed_at,
+        age_s=max(0, int(now) - observed_at),
+    )
+
+
+def forecast_report(city: str, data: Forecast, hours: int = 24) -> ForecastReport:
+    """Build a ForecastReport from a provider forecast."""
+    slots = max(1, hours // 3)
+    steps = [
+        ForecastStep(
+            at=point.dt,
+            temp_c=point.temp_c,
+            condition=point.condition,
+        )
+        for point in data.points[:slots]
+    ]
+    return ForecastReport(city=city, steps=steps)
+
+
+def forecast_summary(data: Forecast, hours: int = 12) -> ForecastSummary:
+    """Summarize the first ``hours`` of a provider forecast."""
+    points = data.points[:max(1, hours // 3)]
+    temps = [point.temp_c for point in points]
+    return ForecastSummary(
+        hours=len(points) * 3,
+        min_temp_c=min(temps),
+        max_temp_c=max(temps),
+        rain_mm=round(sum(point.rain_mm for point in points), 1),
+        steps=[ForecastStep(at=point.dt, temp_c=point.temp_c, condition=point.condition) for point in points],
+    )
+
+
+def city_snapshot(city: str, current: Observation | None, forecast: Forecast | None,
+                  hours: int = 12) -> CitySnapshot:
+    """Build a CitySnapshot from whichever of the observation and forecast were fetched."""
+    snapshot = CitySnapshot(city=city)
+    if current is not None:
+        snapshot["current"] = weather_report(city, current)
+    if forecast is not None and forecast.points:
+        snapshot["forecast"] = forecast_summary(forecast, hours)
+    return snapshot
+
+
+def render_weather_text(report: WeatherReport) -> str:
+    """Render a WeatherReport in the classic multi-line text layout."""
+    return (
+        f"Weather in {report['city']}:\n"
+        f"Temperature: {report['temp_c']} °C\n"
+        f"Feels Like: {report['feels_like_c']} °C\n"
+        f"Condition: {report['condition']}\n"
+        f"Humidity: {report['humidity_pct']}%\n"
+        f"Wind Speed: {report['wind_mps']} m/s"
+    )
+
+
+def render_forecast_text(report: ForecastReport) -> str:
+    """Render a ForecastReport as one line per forecast slot."""
+    lines = [
+        f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(step['at']))}: "
+        f"{step['temp_c']}°C, {step['condition']}"
+        for step in report["steps"]
+    ]
+    return f"Forecast for {report['city']}:\n" + "\n".join(lines)
+
+
+def render_snapshot_text(snapshot: CitySnapshot) -> str:
+    """Render a CitySnapshot: current conditions, then the forecast range and slots."""
+    if "current" in snapshot:
+        parts = [render_weather_text(snapshot["current"])]
+    else:
+        parts = [f"Current weather for {snapshot['city']} is unavailable."]
+    if "forecast" in snapshot:
+        summary = snapshot["forecast"]
+        lines = [
+            f"Next {summary['hours']} hours: {summary['min_temp_c']}–{summary['max_temp_c']} °C, "
+            f"{summary['rain_mm']} mm rain"
+        ]
+        lines += [
+            f"{time.strftime('%H:%M', time.localtime(step['at']))}: {step['temp_c']}°C, {step['condition']}"
+            for step in summary["steps"]
+        ]
+        parts.append("\n".join(lines))
+    else:
+        parts.append("Forecast unavailable.")
+    return "\n\n".join(parts)
+
+
+def render_comparison_line(r: WeatherReport) -> str:
+    """One city's line of a comparison."""
+    return (
+        f"{r['city']}: {r['temp_c']} °C (feels like {r['feels_like_c']} °C), {r['condition']}, "
+        f"{r['humidity_pct']}% humidity, wind {r['wind_mps']} m/s"
+    )
+
+
+def render_comparison_text(reports: list[WeatherReport], missing: list[str] | None = None) -> str:
+    """Render current conditions for several cities side by side, with the extremes."""
+    lines = [render_comparison_line(r) for r in reports]
+    summary = render_comparison_summary(reports, missing)
+    return "\n".join(lines + [summary] if summary else lines)
+
+
+def render_comparison_summary(reports: list[WeatherReport], missing: list[str] | None = None) -> str:
+    """The closing lines of a comparison: the extremes and the cities that couldn't be fetched."""
+    lines = []
+    if len(reports) > 1:
+        warmest = max(reports, key=lambda r: r["temp_c"])
+        coolest = min(reports, key=lambda r: r["temp_c"])
+        humid = max(reports, key=lambda r: r["humidity_pct"])
+        windy = max(reports, key=lambda r: r["wind_mps"])
+        lines.append(
+            f"\nWarmest: {warmest['city']} ({warmest['temp_c']} °C) · Coolest: {coolest['city']} ({coolest['temp_c']} °C) · "
+            f"Most humid: {humid['city']} ({humid['humidity_pct']}%) · Windiest: {windy['city']} ({windy['wind_mps']} m/s)"
+        )
+    if missing:
+        lines.append(f"Couldn't fetch weather for: {', '.join(missing)}")
+    return "\n".join(lines)
+
+
+def render_alerts_text(report: AlertsReport) -> str:
+    """Render an AlertsReport as one line per alert."""
+    if not report["alerts"]:
+        return "No active weather alerts."
+    return "\n".join(
+        f"[{alert['severity'].upper()}] {alert['city']} "
+        f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(alert['at']))}: {alert['message']}"
+        for alert in report["alerts"]
+    )
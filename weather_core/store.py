@@ -0,0 +1,219 @@
+"""
+Observation cache, upstream rate limiter and prefetch schedule.
+
+``MemoryStore`` keeps everything in the process. ``SQLiteStore`` keeps the
+same state in a local SQLite file so several server workers share one cache,
+one rate limit and one refresh schedule instead of multiplying upstream
+traffic. Both expose the same small synchronous API; async callers should
+run it through ``asyncio.to_thread``.
+
+Values are ``Observation`` and ``Forecast`` records (``weather_core.models``);
+SQLite holds their compact array encoding. ``put_if_changed`` skips rewriting
+an entry whose payload ``digest`` (see ``weather_core.providers``) is
+unchanged and only extends its expiry; ``fetched_at`` then keeps pointing at
+when the data last changed.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+import msgspec
+
+from weather_core.models import Forecast, Observation, decode, encode
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: Observation | Forecast
+    fetched_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class MemoryStore:
+    """Single-process store."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._buckets = {}
+        self._schedule = {}
+
+    def get(self, key: str) -> CacheEntry | None:
+        return self._cache.get(key)
+
+    def put(self, key: str, value: Observation | Forecast, ttl: float) -> None:
+        now = time.time()
+        self._cache[key] = CacheEntry(value, now, now + ttl)
+
+    def put_if_changed(self, key: str, value: Observation | Forecast, ttl: float) -> bool:
+        entry = self._cache.get(key)
+        if entry is not None and value.digest and entry.value.digest == value.digest:
+            self._cache[key] = CacheEntry(entry.value, entry.fetched_at, time.time() + ttl)
+            return False
+        self.put(key, value, ttl)
+        return True
+
+    def acquire(self, bucket: str, rate_per_s: float, capacity: float) -> bool:
+        """Take one token from a token bucket; False if the bucket is empty."""
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(bucket, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate_per_s)
+            allowed = tokens >= 1
+            self._buckets[bucket] = (tokens - 1 if allowed else tokens, now)
+            return allowed
+
+    def mark_hot(self, key: str, next_due: float, hot_until: float) -> None:
+        """Keep ``key`` on the prefetch schedule until ``hot_until``."""
+        with self._lock:
+            due, _, lease_until = self._schedule.get(key, (next_due, 0.0, 0.0))
+            self._schedule[key] = (due, hot_until, lease_until)
+
+    def claim_due(self, owner: str, limit: int, lease_s: float) -> list[str]:
+        """Lease up to ``limit`` keys whose refresh is due."""
+        with self._lock:
+            now = time.time()
+            claimed = []
+            for key, (due, hot_until, lease_until) in list(self._schedule.items()):
+                if hot_until < now:
+                    del self._schedule[key]
+                elif due <= now and lease_until < now and len(claimed) < limit:
+                    self._schedule[key] = (due, hot_until, now + lease_s)
+                    claimed.append(key)
+            return claimed
+
+    def reschedule(self, key: str, next_due: float) -> None:
+        with self._lock:
+            if key in self._schedule:
+                _, hot_until, _ = self._schedule[key]
+                self._schedule[key] = (next_due, hot_until, 0.0)
+
+
+class SQLiteStore:
+    """Store shared between processes through a local SQLite database (WAL mode)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL, expires_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS schedule (
+                key TEXT PRIMARY KEY, next_due REAL NOT NULL, hot_until REAL NOT NULL,
+                lease_owner TEXT, lease_until REAL NOT NULL DEFAULT 0
+            );
+            """
+        )
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, fetched_at, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return CacheEntry(decode(row[0]), row[1], row[2])
+        except msgspec.DecodeError:
+            return None  # written by an older version; refetched as a miss
+
+    def put(self, key: str, value: Observation | Forecast, ttl: float) -> None:
+        now = time.time()
+        payload = encode(value).decode()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache (key, value, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now + ttl),
+            )
+
+    def put_if_changed(self, key: str, value: Observation | Forecast, ttl: float) -> bool:
+        if value.digest:
+            with self._lock:
+                # Compared inside SQLite, so the cached payload is never decoded
+                unchanged = self._db.execute(
+                    "UPDATE cache SET expires_at = ? WHERE key = ? AND json_extract(value, '$[#-1]') = ?",
+                    (time.time() + ttl, key, value.digest),
+                ).rowcount
+            if unchanged:
+                return False
+        self.put(key, value, ttl)
+        return True
+
+    def acquire(self, bucket: str, rate_per_s: float, capacity: float) -> bool:
+        with self._lock:
+            # Wall-clock time: monotonic clocks are not comparable across processes
+            now = time.time()
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (bucket,)).fetchone()
+                tokens, updated = row if row else (capacity, now)
+                tokens = min(capacity, tokens + max(0.0, now - updated) * rate_per_s)
+                allowed = tokens >= 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)",
+                    (bucket, tokens - 1 if allowed else tokens, now),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return allowed
+
+    def mark_hot(self, key: str, next_due: float, hot_until: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO schedule (key, next_due, hot_until) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET hot_until = excluded.hot_until",
+                (key, next_due, hot_until),
+            )
+
+    def claim_due(self, owner: str, limit: int, lease_s: float) -> list[str]:
+        with self._lock:
+            now = time.time()
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM schedule WHERE hot_until < ?", (now,))
+                keys = [
+                    row[0]
+                    for row in self._db.execute(
+                        "SELECT key FROM schedule WHERE next_due <= ? AND lease_until < ? ORDER BY next_due LIMIT ?",
+                        (now, now, limit),
+                    )
+                ]
+                self._db.executemany(
+                    "UPDATE schedule SET lease_owner = ?, lease_until = ? WHERE key = ?",
+                    [(owner, now + lease_s, key) for key in keys],
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return keys
+
+    def reschedule(self, key: str, next_due: float) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE schedule SET next_due = ?, lease_owner = NULL, lease_until = 0 WHERE key = ?",
+                (next_due, key),
+            )
+
+
+def open_store(path: str | None = None) -> MemoryStore | SQLiteStore:
+    """Open the shared SQLite store at ``path`` (or $WEATHER_STORE), else an in-process store."""
+    path = path or os.getenv("WEATHER_STORE")
+    return SQLiteStore(path) if path else MemoryStore()
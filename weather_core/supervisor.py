@@ -0,0 +1,212 @@
+"""
+Event-driven supervisor for the MCP server and Streamlit app.
+
+Every replica of a service is owned by one task that:
+
+* starts the process and streams its output line by line into logging, so a
+  chatty child can never block on a full pipe (overlong lines are split)
+* awaits ``process.wait()``, which returns the moment the child exits (the
+  event loop's child watcher reaps it), instead of polling on a timer
+* probes the service's health URL and restarts a process that stops
+  answering for ``max_failures`` checks in a row
+* restarts with exponential backoff, reset once a run has stayed up for
+  ``stable_s`` seconds
+
+Only the standard library is used, like ``weather_core.readiness``.
+"""
+
+import asyncio
+import logging
+import signal
+import time
+from dataclasses import dataclass, field
+
+from weather_core.metrics import metrics
+from weather_core.readiness import probe
+
+logger = logging.getLogger("weather.supervisor")
+
+
+@dataclass
+class ServiceSpec:
+    """How to run one service.
+
+    ``{port}`` in the command or health URL is replaced by ``port + i`` for
+    replica ``i``.
+    """
+
+    name: str
+    command: list[str]
+    health_url: str | None = None
+    port: int | None = None
+    replicas: int = 1
+    env: dict[str, str] | None = None
+    health_interval_s: float = 10.0
+    start_timeout_s: float = 60.0
+    max_failures: int = 3
+    backoff_s: float = 0.5
+    max_backoff_s: float = 30.0
+    stable_s: float = 30.0
+
+
+@dataclass
+class Replica:
+    """One running copy of a service."""
+
+    spec: ServiceSpec
+    index: int
+    process: asyncio.subprocess.Process | None = None
+    restarts: int = 0
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    ready_after_s: float | None = None
+
+    @property
+    def name(self) -> str:
+        return self.spec.name if self.spec.replicas == 1 else f"{self.spec.name}-{self.index + 1}"
+
+    @property
+    def port(self) -> int | None:
+        return None if self.spec.port is None else self.spec.port + self.index
+
+    def format(self, text: str) -> str:
+        return text.replace("{port}", str(self.port)) if self.port is not None else text
+
+
+class Supervisor:
+    """Keep every replica of every service running until ``stop()``."""
+
+    def __init__(self, specs: list[ServiceSpec], grace_s: float = 10.0):
+        self.replicas = [Replica(spec, i) for spec in specs for i in range(spec.replicas)]
+        self.grace_s = grace_s
+        self._stopping = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._supervise(r), name=f"supervise-{r.name}") for r in self.replicas]
+
+    async def wait_ready(self, timeout: float) -> dict[str, float]:
+        """Wait until every replica has passed its first health check."""
+        await asyncio.wait_for(asyncio.gather(*(r.ready.wait() for r in self.replicas)), timeout)
+        return {r.name: r.ready_after_s for r in self.replicas}
+
+    async def run(self) -> None:
+        """Supervise until SIGINT/SIGTERM or ``stop()``, then stop every child."""
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows: Ctrl+C arrives as KeyboardInterrupt instead
+        if not self._tasks:
+            await self.start()
+        try:
+            await self._stopping.wait()
+        finally:
+            await self.close()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def close(self) -> None:
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _supervise(self, replica: Replica) -> None:
+        spec = replica.spec
+        failures = 0
+        while not self._stopping.is_set():
+            started = time.perf_counter()
+            reason = await self._run_once(replica, started)
+            if self._stopping.is_set():
+                return
+            failures = 0 if time.perf_counter() - started >= spec.stable_s else failures + 1
+            delay = min(spec.max_backoff_s, spec.backoff_s * 2 ** (failures - 1)) if failures else 0.0
+            replica.restarts += 1
+            metrics.incr("supervisor.restarts")
+            metrics.incr(f"supervisor.{spec.name}.restarts")
+            logger.warning("%s %s, restarting in %.1fs (restart #%d)", replica.name, reason, delay, replica.restarts)
+            await asyncio.sleep(delay)
+
+    async def _run_once(self, replica: Replica, started: float) -> str:
+        """Run the replica until it exits or is found unhealthy; return why it stopped."""
+        spec = replica.spec
+        replica.process = process = await asyncio.create_subprocess_exec(
+            *(replica.format(part) for part in spec.command),
+            env=spec.env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        logger.info("Started %s (pid %d)", replica.name, process.pid)
+        metrics.gauge(f"supervisor.{replica.name}.up", 1)
+        pump = asyncio.create_task(self._pump(replica.name, process.stdout))
+        health = asyncio.create_task(self._health(replica, started))
+        exited = asyncio.create_task(process.wait())
+        try:
+            done, _ = await asyncio.wait({exited, health}, return_when=asyncio.FIRST_COMPLETED)
+            if exited in done:
+                return f"exited with code {process.returncode}"
+            metrics.incr("supervisor.unhealthy")
+            return health.result()
+        finally:
+            health.cancel()
+            await self._terminate(replica.name, process)
+            exited.cancel()
+            await asyncio.gather(pump, health, exited, return_exceptions=True)
+            metrics.gauge(f"supervisor.{replica.name}.up", 0)
+
+    async def _health(self, replica: Replica, started: float) -> str:
+        """Return (ending the run) once the replica should be restarted."""
+        spec = replica.spec
+        if spec.health_url is None:
+            replica.ready_after_s = replica.ready_after_s or time.perf_counter() - started
+            replica.ready.set()
+            await asyncio.Event().wait()  # nothing to check; only an exit ends the run
+        url = replica.format(spec.health_url)
+        # Until the first answer, poll quickly so readiness is seen promptly
+        deadline = started + spec.start_timeout_s
+        while not await asyncio.to_thread(probe, url):
+            if time.perf_counter() >= deadline:
+                return f"not ready after {spec.start_timeout_s:.0f}s"
+            await asyncio.sleep(0.1)
+        elapsed = time.perf_counter() - started
+        if not replica.ready.is_set():
+            replica.ready_after_s = elapsed
+            replica.ready.set()
+        logger.info("%s ready in %.0f ms", replica.name, elapsed * 1000)
+        failures = 0
+        while True:
+            await asyncio.sleep(spec.health_interval_s)
+            if await asyncio.to_thread(probe, url, 2.0):
+                failures = 0
+                continue
+            failures += 1
+            logger.warning("%s failed health check %d/%d", replica.name, failures, spec.max_failures)
+            if failures >= spec.max_failures:
+                return f"stopped answering {url}"
+
+    async def _pump(self, name: str, stream: asyncio.StreamReader) -> None:
+        while True:
+            try:
+                line = await stream.readuntil(b"\n")
+            except asyncio.LimitOverrunError as exc:
+                # A line longer than the stream limit (64 KiB) is logged in pieces instead of killing the pump
+                line = await stream.read(exc.consumed)
+            except asyncio.IncompleteReadError as exc:
+                line = exc.partial  # output ended without a newline
+            if not line:
+                return
+            logger.info("[%s] %s", name, line.decode(errors="replace").rstrip())
+
+    async def _terminate(self, name: str, process: asyncio.subprocess.Process) -> None:
+        if process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), self.grace_s)
+        except asyncio.TimeoutError:
+            logger.warning("%s didn't stop gracefully, killing it", name)
+            process.kill()
+            await process.wait()
+        logger.info("Stopped %s", name)
@@ -0,0 +1,112 @@
+"""
+Conversation-scoped memoization of MCP tool calls for the agent chat.
+
+Within one chat the LLM often calls ``get_weather`` again for a city it
+looked up a few turns earlier. ``ToolCache.install(connector)`` wraps the
+connector's ``call_tool`` so that a repeated call within the tool's freshness
+TTL returns the earlier result without a round-trip to the server. This
+covers the agent's tool calls, the router's fast path and the prefetcher.
+
+Calls are keyed on the tool name and normalized arguments: defaults from the
+tool's input schema are filled in, ``None`` values dropped and keys sorted, so
+``{"city": "Pune"}`` and ``{"city": "Pune", "include_text": false}`` share an
+entry. Error results are not cached, and tools without a TTL (including any
+tool not listed) are always called. Hits and misses are counted per session;
+``clear`` starts a new one.
+
+Configured with ``WEATHER_TOOL_CACHE`` (``0`` to disable) and
+``WEATHER_TOOL_CACHE_TTLS``, e.g. ``get_weather=120,get_alerts=0``, to
+override the default TTLs.
+"""
+
+import json
+import os
+import time
+from collections import OrderedDict
+
+from weather_core.metrics import metrics
+
+# Seconds a result stays fresh; the server's own cache refreshes observations every 10 minutes
+DEFAULT_TTLS = {"get_weather": 300.0, "get_snapshot": 300.0, "get_forecast": 900.0, "get_alerts": 120.0}
+
+
+class ToolCache:
+    """Memoized ``call_tool`` for one chat session."""
+
+    def __init__(self, ttls: dict[str, float] | None = None, max_entries: int = 256):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._defaults: dict[str, dict] = {}
+        self._connector = None
+
+    @classmethod
+    def from_env(cls) -> "ToolCache":
+        if os.getenv("WEATHER_TOOL_CACHE", "1").lower() in {"0", "false", "off"}:
+            return cls(ttls={})
+        ttls = dict(DEFAULT_TTLS)
+        for item in os.getenv("WEATHER_TOOL_CACHE_TTLS", "").split(","):
+            if "=" in item:
+                name, seconds = item.split("=", 1)
+                ttls[name.strip()] = float(seconds)
+        return cls(ttls)
+
+    def install(self, connector) -> None:
+        """Route ``connector.call_tool`` through this cache."""
+        call_tool = connector.call_tool
+
+        async def memoized_call_tool(name: str, arguments: dict, *args, **kwargs):
+            if self.ttls.get(name, 0) <= 0:
+                return await call_tool(name, arguments, *args, **kwargs)
+            return await self.call(lambda: call_tool(name, arguments, *args, **kwargs), name, arguments)
+
+        connector.call_tool = memoized_call_tool
+        self._connector = connector
+
+    def _tool_defaults(self, name: str) -> dict:
+        if name not in self._defaults:
+            try:
+                tools = self._connector.tools if self._connector is not None else []
+            except RuntimeError:  # not connected yet; try again on the next call
+                return {}
+            for tool in tools or []:
+                properties = (tool.inputSchema or {}).get("properties", {})
+                self._defaults[tool.name] = {k: p["default"] for k, p in properties.items() if "default" in p}
+        return self._defaults.get(name, {})
+
+    def key(self, name: str, arguments: dict | None) -> str:
+        """Cache key for a call: the tool name and its arguments with defaults filled in."""
+        normalized = {**self._tool_defaults(name), **{k: v for k, v in (arguments or {}).items() if v is not None}}
+        return name + json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+
+    async def call(self, fetch, name: str, arguments: dict | None):
+        """Return a fresh cached result for this call, or await ``fetch()`` and cache it."""
+        key = self.key(name, arguments)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            metrics.incr("tool_cache.hit")
+            return entry[1]
+        self.misses += 1
+        metrics.incr("tool_cache.miss")
+        result = await fetch()
+        if not getattr(result, "isError", False):
+            self._entries[key] = (time.monotonic() + self.ttls[name], result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        """Forget every result and start counting a new session."""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def format(self) -> str:
+        calls = self.hits + self.misses
+        rate = f" ({self.hits / calls:.0%} hit rate)" if calls else ""
+        return f"Tool cache this session: {self.hits} hits, {self.misses} misses{rate}, {len(self._entries)} results held"